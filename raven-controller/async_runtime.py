@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Asyncio runtime for RAVEN
+Runs topology ingestion, port statistics, path computation and flow
+programming as separate tasks joined by bounded queues, so one slow ONOS
+call no longer stalls the others
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from topology_diff import TopologyChangeSet
+from topology_events import AdaptivePoller, EventStreamUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOnosClient:
+    """
+    Awaitable facade over OnosClient
+
+    Requests run on worker threads through the pooled keep-alive session, so
+    they never block the event loop; a semaphore bounds how many are in
+    flight at once.
+
+    Args:
+        client: OnosClient
+        max_concurrency: Requests allowed in flight
+    """
+
+    def __init__(self, client, max_concurrency=4):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def call(self, fn, *args, **kwargs):
+        """Run a blocking client call on a worker thread"""
+        if self._semaphore is None:
+            # Created lazily so it binds to the running loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def get(self, endpoint, params=None) -> dict:
+        return await self.call(self.client.get, endpoint, params)
+
+    async def post(self, endpoint, json=None, params=None):
+        return await self.call(self.client.post, endpoint, json=json, params=params)
+
+    async def delete(self, endpoint, json=None):
+        return await self.call(self.client.delete, endpoint, json=json)
+
+    async def get_topology(self):
+        """(devices, links, hosts) lists, fetched concurrently"""
+        devices, links, hosts = await asyncio.gather(self.get('devices'), self.get('links'), self.get('hosts'))
+        return devices.get('devices', []), links.get('links', []), hosts.get('hosts', [])
+
+
+class AsyncRavenRuntime:
+    """
+    Concurrent RAVEN control loop
+
+    Tasks:
+        ingest: polls ONOS (or the event stream) into the topology queue
+        stats: collects port statistics and marks links whose bandwidth moved
+        demand: polls demand sources and queues a cycle when active pairs
+            change (demand-driven mode only)
+        compute: applies topology updates and recomputes paths on a single
+            worker thread, which serializes all graph and metric mutations
+        flows: programs staged flow and group changes into ONOS
+
+    The queues are bounded: when flow programming falls behind, path
+    computation waits for it, and ingestion in turn waits for computation.
+
+    Args:
+        controller: RAVENController
+        topology_queue_size: Pending topology updates before ingestion blocks
+        flow_queue_size: Pending flow update batches before computation blocks
+        onos_concurrency: ONOS requests in flight at once
+    """
+
+    def __init__(self, controller, topology_queue_size=16, flow_queue_size=4, onos_concurrency=4):
+        self.controller = controller
+        self.onos = AsyncOnosClient(controller.onos, onos_concurrency)
+        self.topology_queue_size = topology_queue_size
+        self.flow_queue_size = flow_queue_size
+        self.topology_queue: Optional[asyncio.Queue] = None
+        self.flow_queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='raven-paths')
+        self._tasks = []
+        self._events_queued = False     # Events queued since the last queued snapshot
+
+        metrics = controller.metrics
+        metrics.gauge('raven_topology_queue_depth', 'Topology updates waiting for path computation',
+                      fn=lambda: self.topology_queue.qsize() if self.topology_queue is not None else 0)
+        metrics.gauge('raven_flow_queue_depth', 'Flow update batches waiting to be programmed',
+                      fn=lambda: self.flow_queue.qsize() if self.flow_queue is not None else 0)
+
+    async def run(self):
+        """Run all tasks until stop() is called or one of them fails"""
+        self.topology_queue = asyncio.Queue(maxsize=self.topology_queue_size)
+        self.flow_queue = asyncio.Queue(maxsize=self.flow_queue_size)
+        self._tasks = [asyncio.create_task(self.ingest_topology(), name='raven-ingest'),
+                       asyncio.create_task(self.compute_paths(), name='raven-compute'),
+                       asyncio.create_task(self.program_flows(), name='raven-flows')]
+        if self.controller.stats_interval:
+            self._tasks.append(asyncio.create_task(self.collect_stats(), name='raven-stats'))
+        if self.controller.demand_driven:
+            self._tasks.append(asyncio.create_task(self.collect_demand(), name='raven-demand'))
+
+        logger.info("Starting RAVEN controller (asyncio runtime)...")
+        self.controller.start_metrics()
+        self.controller.start_api()
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+
+    async def _compute(self, fn, *args):
+        """Run fn on the path computation thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # Topology ingestion
+
+    async def ingest_topology(self):
+        controller = self.controller
+        poller = AdaptivePoller(controller.poll_min_interval, controller.poll_max_interval)
+        stream_retry_at = 0.0
+
+        while True:
+            if controller.event_source is not None and time.monotonic() >= stream_retry_at:
+                try:
+                    await self.ingest_events()
+                except EventStreamUnavailable as e:
+                    logger.warning(f"Event stream unavailable ({e}), falling back to polling")
+                    stream_retry_at = time.monotonic() + controller.resync_interval
+                except Exception as e:
+                    logger.error(f"Error in event stream ({e}), falling back to polling")
+                    stream_retry_at = time.monotonic() + controller.resync_interval
+
+            changed = await self.ingest_snapshot()
+            await asyncio.sleep(poller.next_interval(changed))
+
+    async def ingest_snapshot(self) -> bool:
+        """Fetch the full topology and queue it if ONOS reports a change"""
+        try:
+            devices, links, hosts = await self.onos.get_topology()
+        except Exception as e:
+            logger.error(f"Error fetching topology: {e}")
+            return False
+        if not (devices or links):
+            return False
+        # Queued events may not have reached the snapshot yet
+        if not self._events_queued and self.controller.rest_topology_unchanged():
+            return False
+        self._events_queued = False
+        await self.topology_queue.put(('snapshot', devices, links, hosts))
+        return True
+
+    async def ingest_events(self):
+        """Queue pushed events, with a full snapshot every resync_interval"""
+        controller = self.controller
+        await self.ingest_snapshot()
+        last_sync = time.monotonic()
+        logger.info("Event stream connected, waiting for topology events...")
+
+        while True:
+            events = await asyncio.to_thread(controller.event_source.poll, controller.poll_max_interval)
+            if events:
+                self._events_queued = True
+                await self.topology_queue.put(('events', events))
+            if time.monotonic() - last_sync >= controller.resync_interval:
+                await self.ingest_snapshot()
+                last_sync = time.monotonic()
+
+    # Port statistics
+
+    async def collect_stats(self):
+        controller = self.controller
+        collector = controller.port_stats
+        while True:
+            try:
+                if await self.onos.call(collector.collect):
+                    await self._compute(controller.apply_link_telemetry, collector)
+                    if controller.dirty_pairs:
+                        # Re-score the pairs on links whose bandwidth moved
+                        await self.topology_queue.put(('metrics',))
+            except Exception as e:
+                logger.warning(f"Error collecting port statistics: {e}")
+            await asyncio.sleep(controller.stats_interval)
+
+    # Demand
+
+    async def collect_demand(self):
+        controller = self.controller
+        woken = False
+        while True:
+            try:
+                observed, ingress = await self.onos.call(controller.fetch_demand)
+                changed = await self._compute(controller.apply_demand, observed, ingress)
+                if changed or woken:
+                    await self.topology_queue.put(('metrics',))
+            except Exception as e:
+                logger.warning(f"Error collecting demand: {e}")
+            # request_demand() sets the event to cut the wait short
+            woken = await asyncio.to_thread(controller.wakeup.wait, controller.demand_interval)
+            controller.wakeup.clear()
+
+    # Path computation
+
+    def _drain(self, item):
+        """
+        Merge everything waiting in the topology queue into one update
+
+        A snapshot supersedes whatever came before it; events after it are
+        applied in order.
+        """
+        items = [item]
+        while not self.topology_queue.empty():
+            items.append(self.topology_queue.get_nowait())
+
+        snapshot = None
+        events = []
+        for queued in items:
+            if queued[0] == 'snapshot':
+                snapshot, events = queued, []
+            elif queued[0] == 'events':
+                events.extend(queued[1])
+        return snapshot, events
+
+    def _apply_topology(self, snapshot, events):
+        """
+        Apply a snapshot and/or events on the computation thread; fail over first
+
+        Returns:
+            (changes, pairs failed over, staged backup flow updates or None)
+        """
+        controller = self.controller
+        with controller.lock:
+            changes = TopologyChangeSet()
+            if snapshot is not None:
+                controller.snapshot.load(*snapshot[1:])
+            applied = [controller.snapshot.apply(event) for event in events]
+            if snapshot is not None or any(applied):
+                changes = controller.build_graph(*controller.snapshot.lists())
+            failed_over = controller.fail_over(changes) if controller.backup_paths else {}
+            return changes, failed_over, controller.take_flow_updates()
+
+    def _update_paths(self, changes, failed_over):
+        controller = self.controller
+        with controller.lock:
+            controller.update_paths(changes, program_flows=False, failed_over=failed_over)
+            return controller.take_flow_updates()
+
+    async def compute_paths(self):
+        while True:
+            snapshot, events = self._drain(await self.topology_queue.get())
+            try:
+                changes, failed_over, failover = await self._compute(self._apply_topology, snapshot, events)
+                if failover is not None:
+                    # Backup flows go out ahead of the path search
+                    await self.flow_queue.put(failover)
+                updates = await self._compute(self._update_paths, changes, failed_over)
+                if updates is not None:
+                    await self.flow_queue.put(updates)
+            except Exception as e:
+                logger.error(f"Error computing paths: {e}")
+
+    # Flow programming
+
+    async def program_flows(self):
+        while True:
+            flows, groups = await self.flow_queue.get()
+            try:
+                await asyncio.to_thread(self.controller.apply_flow_updates, flows, groups)
+            except Exception as e:
+                logger.error(f"Error programming flows: {e}")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Precomputed backup paths for RAVEN
+Keeps a disjoint backup next to every selected primary path, indexed by the
+primary's links, so a link failure switches pairs over without a path search
+"""
+
+import logging
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from path_search import MIN_RELIABILITY, link_metrics
+from topology_diff import edge_key, path_edges
+
+logger = logging.getLogger(__name__)
+
+SHARED_PENALTY = 1000.0  # Cost of reusing a primary link/node when no disjoint path exists
+
+
+def disjoint_backup(graph, metrics, primary, node_disjoint=True, hop_cost=0.01) -> Optional[List]:
+    """
+    Most reliable path between the ends of primary that avoids its links
+
+    This is the second stage of Suurballe's algorithm with the primary held
+    fixed: a shortest path on -log(reliability) costs in the graph left once
+    the primary is taken out. Primary links (and interior switches, when
+    node_disjoint) are heavily penalized rather than removed, so where no
+    fully disjoint path exists the backup shares as little as possible.
+
+    Args:
+        graph: Topology graph
+        metrics: EdgeMetricStore with per-link reliability
+        primary: Selected path (switches only)
+        node_disjoint: Also avoid the primary's interior switches
+
+    Returns:
+        Backup path, or None if primary has no alternative
+    """
+    if len(primary) < 2:
+        return None
+    src, dst = primary[0], primary[-1]
+    primary_links = set(path_edges(primary))
+    interior = set(primary[1:-1]) if node_disjoint else set()
+
+    def cost(u, v, _):
+        if v != dst and graph.nodes[v].get('type') == 'host':
+            return None  # Hosts never forward
+        reliability, _ = link_metrics(metrics, u, v)
+        weight = -math.log(max(reliability, MIN_RELIABILITY)) + hop_cost
+        if edge_key(u, v) in primary_links:
+            weight += SHARED_PENALTY
+        if v in interior:
+            weight += SHARED_PENALTY
+        return weight
+
+    try:
+        backup = nx.dijkstra_path(graph, src, dst, weight=cost)
+    except nx.NetworkXNoPath:
+        return None
+    if set(path_edges(backup)) >= primary_links:
+        return None  # Only the primary itself: no protection
+    return backup
+
+
+class BackupPath:
+    """A primary path and its precomputed backup"""
+
+    __slots__ = ('primary', 'backup', 'protected')
+
+    def __init__(self, primary, backup):
+        self.primary = primary
+        self.backup = backup
+        # Primary links whose failure the backup survives
+        self.protected: Set[Tuple] = set(path_edges(primary)) - set(path_edges(backup))
+
+
+class BackupPathStore:
+    """
+    Backup paths per pair with an index from protected link to pairs
+
+    A failed link looks up its dependent pairs directly instead of scanning
+    every primary path.
+    """
+
+    def __init__(self):
+        self.paths: Dict[Hashable, BackupPath] = {}
+        self._by_edge: Dict[Tuple, Set[Hashable]] = {}         # protected primary link -> pairs
+        self._by_backup_edge: Dict[Tuple, Set[Hashable]] = {}  # backup link -> pairs
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, pair):
+        return pair in self.paths
+
+    def get(self, pair) -> Optional[BackupPath]:
+        return self.paths.get(pair)
+
+    def set(self, pair, primary, backup):
+        """Store (or clear, if backup is None) the backup of a pair"""
+        self.remove(pair)
+        if not primary or not backup:
+            return
+        entry = BackupPath(primary, backup)
+        self.paths[pair] = entry
+        for edge in entry.protected:
+            self._by_edge.setdefault(edge, set()).add(pair)
+        for edge in path_edges(backup):
+            self._by_backup_edge.setdefault(edge, set()).add(pair)
+
+    def remove(self, pair):
+        entry = self.paths.pop(pair, None)
+        if entry is None:
+            return
+        self._unindex(self._by_edge, entry.protected, pair)
+        self._unindex(self._by_backup_edge, path_edges(entry.backup), pair)
+
+    @staticmethod
+    def _unindex(index, edges, pair):
+        for edge in edges:
+            pairs = index.get(edge)
+            if pairs is not None:
+                pairs.discard(pair)
+                if not pairs:
+                    del index[edge]
+
+    def backed_up_through(self, edges: Iterable[Tuple]) -> Set[Hashable]:
+        """Pairs whose backup uses any of edges (their backup needs recomputing)"""
+        pairs = set()
+        for edge in edges:
+            pairs |= self._by_backup_edge.get(edge, set())
+        return pairs
+
+    def failover(self, failed_edges: Iterable[Tuple]) -> Dict[Hashable, List]:
+        """
+        Switch pairs whose primary lost a link to their backup
+
+        Pairs whose backup is also hit stay out (they need a real search).
+        Switched pairs lose their entry: the backup is now their primary.
+
+        Returns:
+            Dict of pair -> backup path
+        """
+        failed = set(failed_edges)
+        candidates = set()
+        for edge in failed:
+            candidates |= self._by_edge.get(edge, set())
+
+        switched = {}
+        for pair in candidates:
+            entry = self.paths[pair]
+            if failed.isdisjoint(path_edges(entry.backup)):
+                switched[pair] = entry.backup
+            self.remove(pair)
+        return switched
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Candidate path generation for RAVEN
+Streams the k shortest simple paths between two nodes without enumerating
+every simple path in the fabric
+"""
+
+import itertools
+import logging
+import time
+from typing import Iterator, List, Optional
+
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+
+def iter_candidate_paths(graph, src, dst, max_hops: Optional[int] = None,
+                         time_budget: Optional[float] = None) -> Iterator[List]:
+    """
+    Lazily yield simple paths from src to dst in order of increasing hop count
+
+    Uses Yen's algorithm (nx.shortest_simple_paths), which only does the work
+    needed for the next path, so the caller controls the cost by how many
+    paths it pulls.
+
+    Args:
+        graph: NetworkX graph
+        src: Source node
+        dst: Destination node
+        max_hops: Stop once paths get longer than this many hops (None = no limit)
+        time_budget: Wall-clock budget in seconds for the whole enumeration
+            (None = no limit). At least one path is always returned if one exists.
+
+    Yields:
+        Paths as lists of nodes
+    """
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    produced = 0
+
+    for path in nx.shortest_simple_paths(graph, src, dst):
+        # Paths come out shortest first, so the first one over the cutoff ends the search
+        if max_hops is not None and len(path) - 1 > max_hops:
+            return
+
+        yield path
+        produced += 1
+
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.debug(f"Candidate budget exhausted for {src} -> {dst} after {produced} paths")
+            return
+
+
+def k_shortest_paths(graph, src, dst, k=3, max_hops: Optional[int] = None,
+                     time_budget: Optional[float] = None) -> List[List]:
+    """
+    Return at most k candidate paths from src to dst
+
+    Args:
+        graph: NetworkX graph
+        src: Source node
+        dst: Destination node
+        k: Maximum number of paths
+        max_hops: Optional hop-length cutoff
+        time_budget: Optional wall-clock budget in seconds
+
+    Returns:
+        List of up to k paths, shortest first
+
+    Raises:
+        nx.NetworkXNoPath: If dst is not reachable from src
+    """
+    return list(itertools.islice(iter_candidate_paths(graph, src, dst, max_hops, time_budget), k))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Cycle reports and friendly names for RAVEN logs
+Summarizes a path update cycle in a few lines instead of logging every pair,
+with node names resolved from a table built once per topology version
+"""
+
+import logging
+import time
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class AmbiguousName(LookupError):
+    """A friendly name or MAC that matches several nodes"""
+
+
+def friendly_name(node_id, full_mac=False):
+    """
+    Short name of a node id: of:...0003 -> s3, 00:00:00:00:00:05/None -> h5
+
+    Host numbers come from the last MAC octet, or from the whole MAC with
+    full_mac (00:00:00:00:01:01 -> h257, as Mininet numbers hosts past 255).
+    Ids that match neither form are returned unchanged.
+    """
+    if node_id.startswith('of:'):
+        try:
+            return f's{int(node_id[3:], 16)}'
+        except ValueError:
+            return node_id
+
+    # Hosts: MAC, optionally followed by /VLAN
+    mac = node_id.split('/', 1)[0]
+    parts = mac.split(':')
+    if len(parts) >= 6:
+        try:
+            return f'h{int("".join(parts) if full_mac else parts[-1], 16)}'
+        except ValueError:
+            pass
+    return node_id
+
+
+class FriendlyNameTable:
+    """
+    node id -> friendly name for every node of the graph, rebuilt only when
+    the topology version moves
+
+    Hosts whose last-octet names collide are named from their whole MAC.
+    Names or MACs still shared by several nodes (e.g. one MAC on two VLANs)
+    are not resolved to any of them.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.names: Dict[str, str] = {}
+        self.ids: Dict[str, str] = {}   # friendly name or host MAC -> node id
+        self.ambiguous: Set[str] = set()
+
+    def refresh(self, graph, version):
+        if version != self.version:
+            self.names = {node: friendly_name(node) for node in graph.nodes}
+            counts = Counter(self.names.values())
+            for node, name in self.names.items():
+                if counts[name] > 1:
+                    self.names[node] = friendly_name(node, full_mac=True)
+            aliases = list(self.names.items())
+            aliases += [(node, node.split('/', 1)[0].upper()) for node in graph.nodes if '/' in node]
+            self.ids = {}
+            self.ambiguous = set()
+            for node, alias in aliases:
+                if self.ids.setdefault(alias, node) != node:
+                    self.ambiguous.add(alias)
+            for alias in self.ambiguous:
+                del self.ids[alias]
+            self.version = version
+
+    def name(self, node_id):
+        name = self.names.get(node_id)
+        return name if name is not None else friendly_name(node_id)
+
+    def resolve(self, name) -> Optional[str]:
+        """
+        Node id for a friendly name or host MAC (None if unknown)
+
+        Raises:
+            AmbiguousName: If the name matches several nodes
+        """
+        if name in self.ambiguous or name.upper() in self.ambiguous:
+            raise AmbiguousName(name)
+        return self.ids.get(name) or self.ids.get(name.upper())
+
+    def format_path(self, path):
+        return ' -> '.join([self.name(node) for node in path])
+
+
+class PathChange:
+    """A pair whose selected path moved during a cycle"""
+
+    __slots__ = ('pair', 'old_path', 'new_path', 'old_score', 'new_score')
+
+    def __init__(self, pair, old_path, new_path, old_score, new_score):
+        self.pair = pair
+        self.old_path = old_path
+        self.new_path = new_path
+        self.old_score = old_score
+        self.new_score = new_score
+
+    @property
+    def delta(self) -> Optional[float]:
+        if self.old_score is None or self.new_score is None:
+            return None
+        return self.new_score - self.old_score
+
+
+class CycleReport:
+    """
+    Outcome of one update_paths cycle
+
+    Only pairs whose path changed are kept; everything else is counted.
+
+    Args:
+        version: Topology version the cycle ran against
+        hosts: Hosts in the topology
+        host_pairs: Host pairs in the topology
+    """
+
+    def __init__(self, version, hosts, host_pairs):
+        self.version = version
+        self.hosts = hosts
+        self.host_pairs = host_pairs
+        self.recomputed = 0
+        self.unchanged = 0
+        self.no_path = 0
+        self.failed_over = 0
+        self.forgotten = 0
+        self.changes: List[PathChange] = []
+        self.started = time.perf_counter()
+        self.duration = None
+
+    def record(self, pair: Hashable, old_path, new_path, old_score=None, new_score=None):
+        """Record the result of one recomputed pair"""
+        self.recomputed += 1
+        if new_path is None:
+            self.no_path += 1
+        if old_path == new_path:
+            self.unchanged += 1
+        else:
+            self.changes.append(PathChange(pair, old_path, new_path, old_score, new_score))
+
+    def record_failover(self, pair: Hashable, old_path, backup, old_score=None):
+        """Record a pair left on the backup it failed over to (not recomputed this cycle)"""
+        self.changes.append(PathChange(pair, old_path, backup, old_score, None))
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+
+    def top_changes(self, n=5) -> List[PathChange]:
+        """Up to n changes, largest score moves first (new or lost paths last)"""
+        return sorted(self.changes, key=lambda c: -abs(c.delta) if c.delta is not None else 0.0)[:n]
+
+    def summary(self) -> str:
+        duration = f", {self.duration * 1000:.1f} ms" if self.duration is not None else ""
+        return (f"Cycle v{self.version}: {self.hosts} hosts, recomputed {self.recomputed}/{self.host_pairs} pairs, "
+                f"{len(self.changes)} changed, {self.unchanged} unchanged, {self.no_path} without path, "
+                f"{self.failed_over} failed over, {self.forgotten} removed{duration}")
+
+    def log(self, names: FriendlyNameTable, top_n=5, log=logger):
+        """One summary line, then the top_n path changes, written to log"""
+        log.info(self.summary())
+        for change in self.top_changes(top_n):
+            src, dst = change.pair
+            path = names.format_path(change.new_path) if change.new_path else 'no path'
+            if change.delta is not None:
+                score = f" (score {change.old_score:.3f} -> {change.new_score:.3f}, {change.delta:+.3f})"
+            elif change.new_score is not None:
+                score = f" (score {change.new_score:.3f})"
+            else:
+                score = ""
+            log.info(f"  {names.name(src)} -> {names.name(dst)}: {path}{score}")
+
+    def to_dict(self, top_n=None) -> dict:
+        changes = self.changes if top_n is None else self.top_changes(top_n)
+        return {
+            'version': self.version,
+            'hosts': self.hosts,
+            'host_pairs': self.host_pairs,
+            'recomputed': self.recomputed,
+            'changed': len(self.changes),
+            'unchanged': self.unchanged,
+            'no_path': self.no_path,
+            'failed_over': self.failed_over,
+            'removed': self.forgotten,
+            'duration_ms': self.duration * 1000 if self.duration is not None else None,
+            'changes': [{'src': c.pair[0], 'dst': c.pair[1], 'old_path': c.old_path, 'new_path': c.new_path,
+                         'old_score': c.old_score, 'new_score': c.new_score, 'delta': c.delta}
+                        for c in changes],
+        }
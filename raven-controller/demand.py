@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Demand tracking for RAVEN
+Learns which host pairs actually exchange traffic (ONOS flow counters,
+intents, explicit requests) and ages out pairs that went idle, so paths are
+computed and installed only where they are used
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Set, Tuple
+
+from flow_batcher import RAVEN_APP_ID
+from topology_diff import edge_key
+
+logger = logging.getLogger(__name__)
+
+
+class DemandTracker:
+    """
+    Active host pairs with the time each was last seen carrying traffic
+
+    Pairs are unordered: (a, b) and (b, a) are the same demand. The tracker
+    has its own lock: requests arrive on API threads while the control loop
+    expires pairs.
+
+    Args:
+        idle_timeout: Seconds without traffic before a pair is evicted
+    """
+
+    def __init__(self, idle_timeout=300.0):
+        self.idle_timeout = idle_timeout
+        self.last_seen: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.last_seen)
+
+    def __contains__(self, pair):
+        return edge_key(*pair) in self.last_seen
+
+    def touch(self, a, b, now=None) -> bool:
+        """Mark a pair active; True if it was not active before"""
+        key = edge_key(a, b)
+        with self._lock:
+            is_new = key not in self.last_seen
+            self.last_seen[key] = time.monotonic() if now is None else now
+        return is_new
+
+    def pairs(self) -> List[Tuple]:
+        with self._lock:
+            return list(self.last_seen)
+
+    def snapshot(self) -> Dict[Tuple, float]:
+        """Copy of pair -> last seen time"""
+        with self._lock:
+            return dict(self.last_seen)
+
+    def expire(self, now=None) -> List[Tuple]:
+        """Evict pairs idle for longer than idle_timeout and return them"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [pair for pair, seen in self.last_seen.items() if now - seen > self.idle_timeout]
+            for pair in idle:
+                del self.last_seen[pair]
+        return idle
+
+
+class FlowStatsDemand:
+    """
+    Demand from ONOS flow counters (GET /flows)
+
+    Flows matching both ETH_SRC and ETH_DST (such as the reactive forwarding
+    app's) name a MAC pair directly. RAVEN's own rules match ETH_DST only, so
+    they can only tell that something behind a switch still sends to a
+    destination; they keep already known pairs alive rather than adding new
+    ones.
+
+    Args:
+        client: OnosClient
+        app_id: Application id of RAVEN's own flows
+    """
+
+    def __init__(self, client, app_id=RAVEN_APP_ID):
+        self.client = client
+        self.app_id = app_id
+        self._bytes: Dict[str, int] = {}  # flow id -> byte counter at the last poll
+
+    def poll(self) -> Tuple[Set[Tuple[str, str]], Set[Tuple[str, str]]]:
+        """
+        Flows whose byte counters moved since the last poll
+
+        Returns:
+            (set of (src MAC, dst MAC), set of (ingress device, dst MAC))
+        """
+        flows = self.client.get('flows').get('flows', [])
+        pairs, ingress = set(), set()
+        counters = {}
+        for flow in flows:
+            flow_id = str(flow.get('id'))
+            counters[flow_id] = flow.get('bytes', 0)
+            if counters[flow_id] <= self._bytes.get(flow_id, 0):
+                continue
+
+            criteria = {c.get('type'): c.get('mac') for c in flow.get('selector', {}).get('criteria', [])}
+            dst_mac = criteria.get('ETH_DST')
+            if dst_mac is None:
+                continue
+            if criteria.get('ETH_SRC') is not None:
+                pairs.add((criteria['ETH_SRC'], dst_mac))
+            elif flow.get('appId') == self.app_id:
+                ingress.add((flow.get('deviceId'), dst_mac))
+        self._bytes = counters
+        return pairs, ingress
+
+
+class IntentDemand:
+    """
+    Demand from ONOS host-to-host intents (GET /intents)
+
+    Every intent that is not withdrawn keeps the pair of hosts in its
+    resources active.
+
+    Args:
+        client: OnosClient
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def poll(self) -> Tuple[Set[Tuple[str, str]], Set[Tuple[str, str]]]:
+        pairs = set()
+        for intent in self.client.get('intents').get('intents', []):
+            if intent.get('state') in ('WITHDRAWN', 'WITHDRAWING', 'FAILED'):
+                continue
+            # Host resources are MAC/VLAN ids
+            macs = [resource.split('/')[0] for resource in intent.get('resources', [])
+                    if resource.split('/')[0].count(':') == 5]
+            if len(macs) == 2:
+                pairs.add((macs[0], macs[1]))
+        return pairs, set()
+
+
+# Demand sources by name (RAVEN_DEMAND_SOURCES)
+DEMAND_SOURCES = {
+    'flows': FlowStatsDemand,
+    'intents': IntentDemand,
+}
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Edge-indexed link metrics and vectorized RAVEN path scoring
+Reliability, bandwidth and failure counts live in NumPy arrays indexed by an
+integer edge id, so all candidate paths of all pairs are scored at once
+"""
+
+import logging
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from edge_registry import EdgeRegistry
+
+logger = logging.getLogger(__name__)
+
+PAD_EDGE = 0  # Neutral edge used to pad shorter paths in an index matrix
+
+
+class EdgeMetricStore:
+    """
+    Per-link metrics stored in arrays indexed by integer edge id
+
+    Edge ids come from an EdgeRegistry. Edge id 0 is reserved for padding:
+    reliability 1.0 and infinite bandwidth, so it never changes a product or
+    a minimum.
+
+    max_bandwidth (Mbps) is the bandwidth that scores as a full bandwidth
+    term; it should follow the fastest link so the term stays within [0, 1].
+    """
+
+    def __init__(self, capacity=64, default_reliability=1.0, default_bandwidth=100.0, directed=False,
+                 max_bandwidth=100.0):
+        self.default_reliability = default_reliability
+        self.default_bandwidth = default_bandwidth
+        self.max_bandwidth = max_bandwidth
+        self.registry = EdgeRegistry(directed=directed, first_edge_id=PAD_EDGE + 1)
+
+        self.reliability = np.ones(capacity, dtype=np.float64)
+        self.bandwidth = np.full(capacity, np.inf, dtype=np.float64)
+        self.failures = np.zeros(capacity, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.registry)
+
+    def edge_id(self, u, v):
+        """Edge id of (u, v), or None if the edge was never registered"""
+        return self.registry.edge_id(u, v)
+
+    def ensure(self, u, v, reliability=None, bandwidth=None) -> int:
+        """Register (u, v) if needed and return its edge id"""
+        eid = self.registry.edge_id(u, v)
+        if eid is not None:
+            return eid
+
+        eid = self.registry.add_edge(u, v)
+        while eid >= len(self.reliability):
+            self._grow()
+        self.reliability[eid] = self.default_reliability if reliability is None else reliability
+        self.bandwidth[eid] = self.default_bandwidth if bandwidth is None else bandwidth
+        self.failures[eid] = 0
+        return eid
+
+    def path_edge_ids(self, path) -> List[int]:
+        """
+        Edge ids along a path
+
+        Links that were never registered are registered with default metrics
+        and logged, rather than silently scored with defaults on every lookup.
+        """
+        ids = self.registry.path_edge_ids(path)
+        for i, eid in enumerate(ids):
+            if eid is None:
+                logger.warning(f"Link {path[i]} - {path[i + 1]} had no metrics, using defaults")
+                ids[i] = self.ensure(path[i], path[i + 1])
+        return ids
+
+    def index_matrix(self, paths: Sequence[Sequence]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build a padded (num_paths x max_hops) edge id matrix
+
+        Returns:
+            (matrix, hop_counts)
+        """
+        rows = [self.path_edge_ids(path) for path in paths]
+        hops = np.fromiter((len(r) for r in rows), dtype=np.int32, count=len(rows))
+        width = int(hops.max()) if len(rows) else 0
+        matrix = np.full((len(rows), max(width, 1)), PAD_EDGE, dtype=np.int32)
+        for i, row in enumerate(rows):
+            matrix[i, :len(row)] = row
+        return matrix, hops
+
+    def _grow(self):
+        capacity = len(self.reliability) * 2
+        self.reliability = np.concatenate([self.reliability, np.ones(capacity - len(self.reliability))])
+        self.bandwidth = np.concatenate([self.bandwidth, np.full(capacity - len(self.bandwidth), np.inf)])
+        self.failures = np.concatenate([self.failures, np.zeros(capacity - len(self.failures), dtype=np.int32)])
+
+
+def batch_score(store: EdgeMetricStore, matrix: np.ndarray, hops: np.ndarray,
+                alpha=0.6, beta=0.4, max_bandwidth=None, hop_weight=0.1):
+    """
+    Score many paths at once with the RAVEN objective
+
+    Score = alpha * prod(R(l)) + beta * min(BW(l)) / max_bandwidth - hop_weight * hops
+
+    Args:
+        store: EdgeMetricStore holding the link metrics
+        matrix: Padded edge id matrix from EdgeMetricStore.index_matrix
+        hops: Hop count per row
+        max_bandwidth: Bandwidth normalization in Mbps (None = store.max_bandwidth)
+
+    Returns:
+        (reliability, bandwidth, score) arrays, one entry per path
+    """
+    if max_bandwidth is None:
+        max_bandwidth = store.max_bandwidth
+    reliability = store.reliability[matrix].prod(axis=1)
+    bandwidth = store.bandwidth[matrix].min(axis=1)
+    return reliability, bandwidth, raven_score(reliability, bandwidth, hops, alpha, beta, max_bandwidth, hop_weight)
+
+
+def raven_score(reliability, bandwidth, hops, alpha, beta, max_bandwidth, hop_weight=0.1):
+    """RAVEN objective from per-path reliability products, bottleneck bandwidths and hop counts"""
+    return alpha * reliability + beta * (bandwidth / max_bandwidth) - hop_weight * hops
+
+
+def best_per_group(scores: np.ndarray, group_sizes: Sequence[int]) -> np.ndarray:
+    """
+    Index (into scores) of the highest score in each consecutive group
+
+    Ties go to the earliest row, matching a sequential strict '>' scan.
+    Empty groups get -1.
+    """
+    sizes = np.asarray(group_sizes, dtype=np.int64)
+    best = np.full(len(sizes), -1, dtype=np.int64)
+    nonempty = sizes > 0
+    if not nonempty.any():
+        return best
+
+    starts = (np.cumsum(sizes) - sizes)[nonempty]
+    group_max = np.maximum.reduceat(scores, starts)
+    row_group = np.repeat(np.arange(len(starts)), sizes[nonempty])
+    rows = np.arange(len(scores))
+    candidates = np.where(scores == group_max[row_group], rows, len(scores))
+    best[nonempty] = np.minimum.reduceat(candidates, starts)
+    return best
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Edge registry for RAVEN
+Interns node ids to integers and maps node pairs to stable integer edge ids
+"""
+
+import logging
+from typing import Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EdgeRegistry:
+    """
+    Stable integer ids for nodes and links
+
+    In undirected mode (the default, matching the nx.Graph topology) both
+    orientations of a link share one edge id, so s1->s2 and s2->s1 find the
+    same metrics. In directed mode each orientation gets its own id.
+
+    Edge ids start at first_edge_id so callers can reserve low ids (e.g. a
+    padding edge).
+    """
+
+    def __init__(self, directed=False, first_edge_id=1):
+        self.directed = directed
+        self.node_index: Dict[Hashable, int] = {}
+        self.nodes: List[Hashable] = []
+        self._edges: Dict[Tuple[int, int], int] = {}   # (node index, node index) -> edge id
+        self.endpoints: Dict[int, Tuple[Hashable, Hashable]] = {}
+        self.next_edge_id = first_edge_id
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def intern(self, node) -> int:
+        """Integer index of a node, assigned on first sight"""
+        index = self.node_index.get(node)
+        if index is None:
+            index = len(self.nodes)
+            self.node_index[node] = index
+            self.nodes.append(node)
+        return index
+
+    def add_edge(self, u, v) -> int:
+        """Edge id for (u, v), registering the link if needed"""
+        iu, iv = self.intern(u), self.intern(v)
+        eid = self._edges.get((iu, iv))
+        if eid is not None:
+            return eid
+
+        eid = self.next_edge_id
+        self.next_edge_id += 1
+        self._edges[(iu, iv)] = eid
+        if not self.directed:
+            self._edges[(iv, iu)] = eid
+        self.endpoints[eid] = (u, v)
+        return eid
+
+    def edge_id(self, u, v) -> Optional[int]:
+        """Edge id for (u, v), or None if the link was never registered"""
+        iu = self.node_index.get(u)
+        iv = self.node_index.get(v)
+        if iu is None or iv is None:
+            return None
+        return self._edges.get((iu, iv))
+
+    def path_edge_ids(self, path, missing=None) -> List[Optional[int]]:
+        """Edge ids along a path; unregistered links map to missing"""
+        index = self.node_index
+        edges = self._edges
+        ids = [index.get(node) for node in path]
+        return [edges.get((ids[i], ids[i + 1]), missing) for i in range(len(ids) - 1)]
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+OpenFlow fast-failover groups for RAVEN
+Pre-installs primary/backup output ports as FAILOVER groups, so a switch
+moves traffic to the backup port as soon as the primary port goes down,
+before the controller even hears about it
+"""
+
+import logging
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from flow_batcher import RAVEN_APP_ID, RAVEN_FLOW_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+# Above RAVEN's plain forwarding rules, so the group takes precedence while installed
+FAILOVER_FLOW_PRIORITY = RAVEN_FLOW_PRIORITY + 1
+# Standby rules along backup paths, below any primary rule for the same destination
+BACKUP_FLOW_PRIORITY = RAVEN_FLOW_PRIORITY - 1
+
+
+class FailoverGroup:
+    """FAILOVER group on device_id for traffic to dst_mac: primary port, then backup port"""
+
+    __slots__ = ('device_id', 'dst_mac', 'primary_port', 'backup_port')
+
+    def __init__(self, device_id, dst_mac, primary_port, backup_port):
+        self.device_id = device_id
+        self.dst_mac = dst_mac
+        self.primary_port = str(primary_port)
+        self.backup_port = str(backup_port)
+
+    def key(self) -> Tuple[str, str]:
+        return (self.device_id, self.dst_mac)
+
+    @property
+    def group_id(self) -> int:
+        """Stable group id per (device, destination)"""
+        return zlib.crc32(f"{self.device_id}/{self.dst_mac}".encode()) & 0x7fffffff
+
+    @property
+    def app_cookie(self) -> str:
+        return f"0x{self.group_id:08x}"
+
+    def to_json(self) -> dict:
+        """ONOS REST group representation (POST /groups/{deviceId})"""
+        return {
+            "type": "FAILOVER",
+            "appCookie": self.app_cookie,
+            "groupId": str(self.group_id),
+            "buckets": [
+                {"treatment": {"instructions": [{"type": "OUTPUT", "port": port}]}, "watchPort": port}
+                for port in (self.primary_port, self.backup_port)
+            ]
+        }
+
+    def flow_json(self) -> dict:
+        """Flow sending dst_mac traffic into the group"""
+        return {
+            "priority": FAILOVER_FLOW_PRIORITY,
+            "timeout": 0,
+            "isPermanent": True,
+            "deviceId": self.device_id,
+            "treatment": {"instructions": [{"type": "GROUP", "groupId": self.group_id}]},
+            "selector": {"criteria": [{"type": "ETH_DST", "mac": self.dst_mac}]}
+        }
+
+    def __eq__(self, other):
+        return (isinstance(other, FailoverGroup) and self.key() == other.key()
+                and (self.primary_port, self.backup_port) == (other.primary_port, other.backup_port))
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"FailoverGroup({self.device_id}, {self.dst_mac} -> {self.primary_port}/{self.backup_port})"
+
+
+class FailoverGroupManager:
+    """
+    Desired vs installed failover groups, reconciled like FlowStore
+
+    Each pair owns a list of groups. When several pairs want a group for the
+    same (device, destination), the last one set wins, as for flow rules.
+
+    Args:
+        client: OnosClient
+        app_id: ONOS application id owning the group flows
+    """
+
+    def __init__(self, client, app_id=RAVEN_APP_ID):
+        self.client = client
+        self.app_id = app_id
+        self.installed: Dict[Tuple, Tuple[FailoverGroup, Optional[str]]] = {}  # key -> (group, flow id)
+        self._pair_groups: Dict[Hashable, List[FailoverGroup]] = {}
+
+    def set_pair(self, pair, groups: List[FailoverGroup]):
+        if groups:
+            self._pair_groups[pair] = list(groups)
+        else:
+            self._pair_groups.pop(pair, None)
+
+    def remove_pair(self, pair):
+        self._pair_groups.pop(pair, None)
+
+    def desired(self) -> Dict[Tuple, FailoverGroup]:
+        groups = {}
+        for pair_groups in self._pair_groups.values():
+            for group in pair_groups:
+                groups[group.key()] = group
+        return groups
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        Install missing or changed groups and remove stale ones
+
+        Returns:
+            (groups added, groups removed)
+        """
+        desired = self.desired()
+        stale = [key for key, (group, _) in self.installed.items() if desired.get(key) != group]
+        if any(self.installed[key][1] is None for key in stale) and not self._lookup_flow_ids(stale):
+            # Without the flow ids the groups cannot go safely; retried next sync
+            stale = [key for key in stale if self.installed[key][1] is not None]
+        removed = sum(1 for key in stale if self._remove(key))
+
+        to_add = [group for key, group in desired.items() if key not in self.installed]
+        added = [group for group in to_add if self._post_group(group)]
+        if added:
+            self._post_flows(added)
+
+        if added or removed:
+            logger.info(f"Failover groups: +{len(added)} -{removed} ({len(self.installed)} installed)")
+        return len(added), removed
+
+    def _post_group(self, group) -> bool:
+        try:
+            response = self.client.post(f"groups/{group.device_id}", json=group.to_json())
+            if response.status_code in (200, 201):
+                return True
+            logger.error(f"Failover group install failed on {group.device_id}: HTTP {response.status_code}")
+        except Exception as e:
+            logger.error(f"Error installing failover group: {e}")
+        return False
+
+    def _post_flows(self, groups):
+        flow_ids = []
+        try:
+            response = self.client.post("flows", json={"flows": [group.flow_json() for group in groups]},
+                                        params={"appId": self.app_id})
+            if response.status_code in (200, 201):
+                flow_ids = [flow.get('flowId') for flow in response.json().get('flows', [])]
+            else:
+                logger.error(f"Failover group flow install failed: HTTP {response.status_code}")
+        except Exception as e:
+            logger.error(f"Error installing failover group flows: {e}")
+        if len(flow_ids) != len(groups):
+            flow_ids = [None] * len(groups)
+        for group, flow_id in zip(groups, flow_ids):
+            self.installed[group.key()] = (group, flow_id)
+
+    def _lookup_flow_ids(self, keys) -> bool:
+        """
+        Fill in unknown flow ids of installed groups by selector from ONOS's listing
+
+        Groups whose flow is not listed keep flow id None: there is no flow
+        left to delete before them.
+
+        Returns:
+            False if ONOS could not be asked
+        """
+        try:
+            flows = self.client.get(f"flows/application/{self.app_id}").get('flows', [])
+        except Exception as e:
+            logger.error(f"Error listing failover group flows: {e}")
+            return False
+        listed = {}
+        for flow in flows:
+            if flow.get('priority') != FAILOVER_FLOW_PRIORITY:
+                continue
+            for criterion in flow.get('selector', {}).get('criteria', []):
+                if criterion.get('type') == 'ETH_DST':
+                    listed[(flow.get('deviceId'), criterion.get('mac', '').upper())] = flow.get('id')
+        for key in keys:
+            group, flow_id = self.installed[key]
+            if flow_id is None:
+                self.installed[key] = (group, listed.get((group.device_id, group.dst_mac.upper())))
+        return True
+
+    def _remove(self, key) -> bool:
+        """Delete a group's flow, then the group itself; False leaves it installed for a retry"""
+        group, flow_id = self.installed[key]
+        try:
+            if flow_id is not None:
+                response = self.client.delete(f"flows/{group.device_id}/{flow_id}")
+                if response.status_code not in (200, 204, 404):
+                    logger.error(f"Failover group flow removal failed on {group.device_id}: HTTP {response.status_code}")
+                    return False
+                # The flow is gone; a failed group delete below only retries the group
+                self.installed[key] = (group, None)
+            response = self.client.delete(f"groups/{group.device_id}/{group.app_cookie}")
+            if response.status_code not in (200, 204, 404):
+                logger.error(f"Failover group removal failed on {group.device_id}: HTTP {response.status_code}")
+                return False
+        except Exception as e:
+            logger.error(f"Error removing failover group: {e}")
+            return False
+        del self.installed[key]
+        return True
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+In-process ONOS stand-in for RAVEN
+Serves the REST endpoints RAVEN uses (devices, links, hosts, flows, groups,
+port statistics, topology events) from a generated topology, with
+configurable latency and link flaps, so the controller can be exercised
+without ONOS or Mininet
+"""
+
+import argparse
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import Flask, jsonify, make_response, request
+from werkzeug.serving import make_server
+
+from topology_events import FakeEventSource
+from topology_generators import TOPOLOGIES, OnosTopologyBuilder
+
+logger = logging.getLogger(__name__)
+
+
+class FakeOnos:
+    """
+    Fake ONOS REST API backed by an OnosTopologyBuilder
+
+    GET responses carry ETags, so conditional requests from OnosClient get
+    304s while nothing changes. Port byte counters grow at a per-port rate
+    drawn around load * portSpeed. Link flaps are also published as
+    LINK_REMOVED/LINK_ADDED events on the long-poll endpoint read by
+    topology_events.HttpEventStream (GET /onos/v1/raven/events).
+
+    Args:
+        builder: Topology to serve
+        latency: Seconds added to every request
+        jitter: Extra random latency, uniform in [0, jitter] seconds
+        flap_interval: Seconds between link flaps (None = links never flap)
+        flap_count: Links taken down (or brought back) per flap
+        load: Mean port utilization as a fraction of port speed
+        seed: Random seed for flaps and port rates
+    """
+
+    def __init__(self, builder: OnosTopologyBuilder, latency=0.0, jitter=0.0, flap_interval=None,
+                 flap_count=1, load=0.3, seed=0):
+        self.builder = builder
+        self.latency = latency
+        self.jitter = jitter
+        self.flap_interval = flap_interval
+        self.flap_count = flap_count
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.down_links = set()                      # Indexes of switch link pairs currently down
+        self.flows: Dict[str, dict] = {}             # flow id -> flow
+        self.groups: Dict[tuple, dict] = {}          # (device, appCookie) -> group
+        self.intents: List[dict] = []                # Served as-is on GET /intents
+        self.events = FakeEventSource()              # Link flaps as topology events
+        self.requests = 0
+        self._flow_ids = itertools.count(1)
+        self._started = time.monotonic()
+        # Bytes/s sent per port, roughly load * speed
+        self._rates = {key: speed * 1e6 / 8 * load * self.random.uniform(0.5, 1.5)
+                       for key, speed in builder.port_speeds.items()}
+
+        self.app = self._create_app()
+        self._server = None
+        self._threads = []
+        self._stop = threading.Event()
+
+    # Topology state
+
+    def links(self):
+        """Active links (a link pair that is down is missing, as in ONOS)"""
+        with self.lock:
+            return [link for i, link in enumerate(self.builder.links) if i // 2 not in self.down_links]
+
+    def flap(self):
+        """Take random links down, or bring down links back up"""
+        with self.lock:
+            pairs = len(self.builder.links) // 2
+            for _ in range(self.flap_count):
+                if self.down_links and self.random.random() < 0.5:
+                    link = self.random.choice(sorted(self.down_links))
+                    self.down_links.discard(link)
+                    self._emit_link_events('LINK_ADDED', link)
+                    logger.info(f"Fake ONOS: link {link} up")
+                elif pairs:
+                    link = self.random.randrange(pairs)
+                    if link in self.down_links:
+                        continue
+                    self.down_links.add(link)
+                    self._emit_link_events('LINK_REMOVED', link)
+                    logger.info(f"Fake ONOS: link {link} down")
+
+    def _emit_link_events(self, type, link):
+        # Both directions of a link pair, as ONOS reports them
+        for subject in self.builder.links[2 * link:2 * link + 2]:
+            self.events.emit(type, subject)
+
+    def port_statistics(self):
+        elapsed = time.monotonic() - self._started
+        by_device = {}
+        for (device, port), rate in self._rates.items():
+            sent = int(rate * elapsed)
+            by_device.setdefault(device, []).append(
+                {"port": int(port), "bytesSent": sent, "bytesReceived": sent})
+        return [{"device": device, "ports": ports} for device, ports in by_device.items()]
+
+    # REST API
+
+    def _create_app(self):
+        app = Flask('fake-onos')
+        app.logger.disabled = True
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+        def respond(payload):
+            response = make_response(jsonify(payload))
+            response.add_etag()
+            return response.make_conditional(request)
+
+        @app.before_request
+        def delay():
+            self.requests += 1
+            wait = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if wait > 0:
+                time.sleep(wait)
+
+        @app.get('/onos/v1/devices')
+        def devices():
+            return respond({"devices": self.builder.devices})
+
+        @app.get('/onos/v1/devices/ports')
+        def device_ports():
+            return respond({"ports": self.builder.ports()})
+
+        @app.get('/onos/v1/links')
+        def links():
+            return respond({"links": self.links()})
+
+        @app.get('/onos/v1/hosts')
+        def hosts():
+            return respond({"hosts": self.builder.hosts})
+
+        @app.get('/onos/v1/applications')
+        def applications():
+            return respond({"applications": [{"name": "org.onosproject.fwd", "state": "ACTIVE"}]})
+
+        @app.get('/onos/v1/intents')
+        def intents():
+            with self.lock:
+                return respond({"intents": list(self.intents)})
+
+        @app.get('/onos/v1/raven/events')
+        def events():
+            # Long poll: answer as soon as there are events after `since`, or after `timeout` seconds
+            since = request.args.get('since', 0, type=int)
+            timeout = min(request.args.get('timeout', 0.0, type=float), 30.0)
+            events, seq = self.events.events_since(since, timeout)
+            return jsonify({"events": [event.to_json() for event in events], "seq": seq})
+
+        @app.get('/onos/v1/statistics/ports')
+        def statistics():
+            return jsonify({"statistics": self.port_statistics()})
+
+        @app.get('/onos/v1/flows')
+        def flows():
+            with self.lock:
+                return respond({"flows": list(self.flows.values())})
+
+        @app.get('/onos/v1/flows/application/<app_id>')
+        def application_flows(app_id):
+            with self.lock:
+                return respond({"flows": [f for f in self.flows.values() if f.get('appId') == app_id]})
+
+        @app.post('/onos/v1/flows')
+        def add_flows():
+            return jsonify({"flows": self._add_flows(request.json.get('flows', []), request.args.get('appId'))}), 201
+
+        @app.post('/onos/v1/flows/<device_id>')
+        def add_flow(device_id):
+            added = self._add_flows([dict(request.json, deviceId=device_id)], request.args.get('appId'))
+            response = make_response('', 201)
+            response.headers['Location'] = f"{request.url_root}onos/v1/flows/{device_id}/{added[0]['flowId']}"
+            return response
+
+        @app.delete('/onos/v1/flows')
+        def remove_flows():
+            with self.lock:
+                for flow in request.json.get('flows', []):
+                    self.flows.pop(str(flow.get('flowId')), None)
+            return '', 204
+
+        @app.delete('/onos/v1/flows/<device_id>/<flow_id>')
+        def remove_flow(device_id, flow_id):
+            with self.lock:
+                self.flows.pop(flow_id, None)
+            return '', 204
+
+        @app.get('/onos/v1/groups')
+        def groups():
+            with self.lock:
+                return respond({"groups": [dict(g, deviceId=d) for (d, _), g in self.groups.items()]})
+
+        @app.post('/onos/v1/groups/<device_id>')
+        def add_group(device_id):
+            with self.lock:
+                self.groups[(device_id, request.json.get('appCookie'))] = request.json
+            return '', 201
+
+        @app.delete('/onos/v1/groups/<device_id>/<app_cookie>')
+        def remove_group(device_id, app_cookie):
+            with self.lock:
+                self.groups.pop((device_id, app_cookie), None)
+            return '', 204
+
+        return app
+
+    def _add_flows(self, flows, app_id):
+        added = []
+        with self.lock:
+            for flow in flows:
+                flow_id = str(next(self._flow_ids))
+                self.flows[flow_id] = dict(flow, id=flow_id, appId=app_id, state='ADDED')
+                added.append({"deviceId": flow.get('deviceId'), "flowId": flow_id})
+        return added
+
+    # Server lifecycle
+
+    def start(self, host='127.0.0.1', port=8181) -> str:
+        """
+        Serve in background threads
+
+        Returns:
+            Base URL to pass to RAVENController / OnosClient
+        """
+        self._server = make_server(host, port, self.app, threaded=True)
+        self._threads = [threading.Thread(target=self._server.serve_forever, name='fake-onos', daemon=True)]
+        if self.flap_interval:
+            self._threads.append(threading.Thread(target=self._flap_loop, name='fake-onos-flaps', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        url = f"http://{host}:{self._server.server_port}"
+        logger.info(f"Fake ONOS serving {len(self.builder.devices)} devices, {len(self.builder.hosts)} hosts on {url} "
+                    f"(events: {url}/onos/v1/raven/events)")
+        return url
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+    def _flap_loop(self):
+        while not self._stop.wait(self.flap_interval):
+            self.flap()
+
+
+def fake_onos_from_name(name, latency=0.0, jitter=0.0, flap_interval=None, flap_count=1, seed=0, **params):
+    """Build a FakeOnos around a named generator from topology_generators.TOPOLOGIES"""
+    builder = OnosTopologyBuilder()
+    TOPOLOGIES[name](builder=builder, **params)
+    return FakeOnos(builder, latency=latency, jitter=jitter, flap_interval=flap_interval,
+                    flap_count=flap_count, seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a generated topology through a fake ONOS REST API")
+    parser.add_argument('--topology', choices=sorted(TOPOLOGIES), default='diamond4')
+    parser.add_argument('--k', type=int, default=4, help='fat-tree arity')
+    parser.add_argument('--hosts-per-edge', type=int, default=None, help='fat-tree hosts per edge switch')
+    parser.add_argument('--spines', type=int, default=4)
+    parser.add_argument('--leaves', type=int, default=4)
+    parser.add_argument('--hosts-per-leaf', type=int, default=2)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8181)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--flap-interval', type=float, default=None, help='seconds between link flaps')
+    parser.add_argument('--flap-count', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    params: Dict[str, Optional[int]] = {}
+    if args.topology == 'fat-tree':
+        params = {'k': args.k, 'hosts_per_edge': args.hosts_per_edge}
+    elif args.topology == 'leaf-spine':
+        params = {'spines': args.spines, 'leaves': args.leaves, 'hosts_per_leaf': args.hosts_per_leaf}
+
+    logging.basicConfig(level=logging.INFO)
+    fake = fake_onos_from_name(args.topology, latency=args.latency, jitter=args.jitter,
+                               flap_interval=args.flap_interval, flap_count=args.flap_count,
+                               seed=args.seed, **params)
+    fake.start(args.host, args.port)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Desired-state flow store for RAVEN
+Tracks the flows RAVEN has installed (by ONOS flow id) and reconciles them
+against the currently selected paths with a minimal add/remove set
+"""
+
+import logging
+import time
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from flow_batcher import FlowBatcher, FlowRule, RAVEN_APP_ID, RAVEN_FLOW_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+
+def rule_from_onos(flow) -> Optional[FlowRule]:
+    """Parse an ONOS flow JSON into a FlowRule, or None if it is not a RAVEN-shaped rule"""
+    criteria = flow.get('selector', {}).get('criteria', [])
+    instructions = flow.get('treatment', {}).get('instructions', [])
+    dst_mac = next((c.get('mac') for c in criteria if c.get('type') == 'ETH_DST'), None)
+    port = next((i.get('port') for i in instructions if i.get('type') == 'OUTPUT'), None)
+    if dst_mac is None or port is None or len(criteria) != 1:
+        return None
+    return FlowRule(flow['deviceId'], dst_mac, port, flow.get('priority', RAVEN_FLOW_PRIORITY))
+
+
+class FlowSyncReport:
+    """Outcome of one FlowStore.sync()"""
+
+    def __init__(self):
+        self.added = 0
+        self.removed = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    def summary(self) -> str:
+        return (f"+{self.added} -{self.removed} flows ({self.unchanged} unchanged, {self.failed} failed) "
+                f"in {self.elapsed * 1000:.1f} ms")
+
+
+class FlowStore:
+    """
+    Desired vs installed RAVEN flow state
+
+    Each host pair owns a list of rules; rules shared by several pairs (same
+    device and destination) are installed once. When pairs disagree on the
+    output port of a shared selector, the most recently set owner wins, and
+    the remaining owners take over when it leaves. sync() only looks at
+    selectors touched since the last sync, so steady state costs nothing.
+
+    Args:
+        client: OnosClient
+        app_id: ONOS application id owning RAVEN's flows
+        batch_size: Flows per bulk request
+    """
+
+    def __init__(self, client, app_id=RAVEN_APP_ID, batch_size=200):
+        self.client = client
+        self.app_id = app_id
+        self.batch_size = batch_size
+
+        self.installed: Dict[Tuple, Tuple[FlowRule, Optional[str]]] = {}  # selector key -> (rule, flow id)
+        self._pair_rules: Dict[Hashable, List[FlowRule]] = {}
+        self._desired: Dict[Tuple, FlowRule] = {}         # selector key -> rule
+        self._owners: Dict[Tuple, Dict[Hashable, FlowRule]] = {}  # selector key -> pair -> its rule, in set order
+        self._dirty: Set[Tuple] = set()
+        self.loaded = False
+
+    def load_installed(self):
+        """Fetch RAVEN's flows from ONOS once and track them locally by flow id"""
+        response = self.client.get(f"flows/application/{self.app_id}")
+        self.installed = {}
+        for flow in response.get('flows', []):
+            rule = rule_from_onos(flow)
+            if rule is None:
+                continue
+            key = rule.selector_key()
+            if key in self.installed:
+                # Duplicate selector left by an earlier run: keep one, drop the other on sync
+                self._remove_flows([(rule, flow['id'])])
+                continue
+            self.installed[key] = (rule, flow['id'])
+
+        self._dirty.update(self.installed)
+        self.loaded = True
+        logger.info(f"Flow store: {len(self.installed)} RAVEN flows already installed")
+
+    def set_pair(self, pair, rules: List[FlowRule]):
+        """Replace the rules a host pair needs (empty list = pair needs none)"""
+        old = self._pair_rules.pop(pair, [])
+        for rule in old:
+            key = rule.selector_key()
+            owners = self._owners.get(key)
+            if owners is not None:
+                owners.pop(pair, None)
+                if owners:
+                    # Fall back to the rule of the latest remaining owner
+                    self._desired[key] = next(reversed(owners.values()))
+                else:
+                    del self._owners[key]
+                    self._desired.pop(key, None)
+            self._dirty.add(key)
+
+        if rules:
+            self._pair_rules[pair] = rules
+        for rule in rules:
+            key = rule.selector_key()
+            self._owners.setdefault(key, {})[pair] = rule
+            self._desired[key] = rule
+            self._dirty.add(key)
+
+    def remove_pair(self, pair):
+        self.set_pair(pair, [])
+
+    def pairs(self):
+        return self._pair_rules.keys()
+
+    def sync(self) -> FlowSyncReport:
+        """Install missing flows and remove stale ones, touching only dirty selectors"""
+        report = FlowSyncReport()
+        start = time.perf_counter()
+        if not self.loaded:
+            self.load_installed()
+        if any(flow_id is None for _, flow_id in self.installed.values()):
+            # Installs whose response carried no flow id: confirm them against ONOS
+            self._refresh_flow_ids()
+
+        to_add: List[FlowRule] = []
+        to_remove: List[Tuple[FlowRule, Optional[str]]] = []
+        for key in self._dirty:
+            desired = self._desired.get(key)
+            installed = self.installed.get(key)
+            if installed is not None and desired is not None and installed[0].output_port == desired.output_port:
+                report.unchanged += 1
+                continue
+            if installed is not None:
+                to_remove.append(installed)
+            if desired is not None:
+                to_add.append(desired)
+        self._dirty = set()
+
+        if any(flow_id is None for _, flow_id in to_remove):
+            # Some ids were never reported by ONOS; refresh them before deleting
+            self._refresh_flow_ids()
+            to_remove = [self.installed.get(rule.selector_key(), (rule, None)) for rule, _ in to_remove]
+
+        if to_remove:
+            report.removed, failed = self._remove_flows(to_remove)
+            report.failed += failed
+            # Keep failed removals dirty, and don't stack a replacement on top of them
+            stuck = {rule.selector_key() for rule, _ in to_remove
+                     if self.installed.get(rule.selector_key(), (None, None))[0] == rule}
+            self._dirty.update(stuck)
+            to_add = [rule for rule in to_add if rule.selector_key() not in stuck]
+
+        if to_add:
+            batcher = FlowBatcher(self.client, batch_size=self.batch_size, app_id=self.app_id)
+            batcher.add_all(to_add)
+            install = batcher.flush()
+            for rule, flow_id in install.installed_rules:
+                self.installed[rule.selector_key()] = (rule, flow_id)
+            report.added = install.installed
+            report.failed += install.failed
+            # Failed adds stay dirty and are retried on the next sync
+            self._dirty.update(rule.selector_key() for rule in to_add
+                               if rule.selector_key() not in self.installed)
+
+        report.elapsed = time.perf_counter() - start
+        if to_add or to_remove:
+            logger.info(f"Flow sync: {report.summary()}")
+        return report
+
+    def _refresh_flow_ids(self):
+        """
+        Fill in flow ids from ONOS's listing
+
+        Installed entries that ONOS does not list are dropped and marked
+        dirty, so the next sync installs their desired rule again.
+        """
+        response = self.client.get(f"flows/application/{self.app_id}")
+        listed = set()
+        for flow in response.get('flows', []):
+            rule = rule_from_onos(flow)
+            if rule is None:
+                continue
+            key = rule.selector_key()
+            installed = self.installed.get(key)
+            if installed is not None and installed[0] == rule:
+                self.installed[key] = (rule, flow['id'])
+                listed.add(key)
+
+        for key in [key for key in self.installed if key not in listed]:
+            logger.warning(f"Flow {self.installed[key][0]} is no longer in ONOS, reinstalling")
+            del self.installed[key]
+            self._dirty.add(key)
+
+    def _remove_flows(self, flows) -> Tuple[int, int]:
+        """Bulk-delete (rule, flow id) entries; returns (removed, failed)"""
+        removed = failed = 0
+        for i in range(0, len(flows), self.batch_size):
+            batch = [(rule, flow_id) for rule, flow_id in flows[i:i + self.batch_size] if flow_id is not None]
+            if not batch:
+                continue
+            payload = {"flows": [{"deviceId": rule.device_id, "flowId": flow_id} for rule, flow_id in batch]}
+            try:
+                response = self.client.delete("flows", json=payload)
+                ok = response.status_code in (200, 204)
+            except Exception as e:
+                logger.error(f"Error removing flow batch: {e}")
+                ok = False
+            if not ok:
+                failed += len(batch)
+                continue
+            removed += len(batch)
+            for rule, flow_id in batch:
+                key = rule.selector_key()
+                if self.installed.get(key, (None, None))[1] == flow_id:
+                    del self.installed[key]
+        return removed, failed
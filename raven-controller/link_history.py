@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Link state history for RAVEN
+Records up/down transitions per link and maintains time-decayed availability
+and flap rate incrementally, O(1) per event
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LinkHistory:
+    """
+    Up/down history of one link
+
+    uptime and downtime are exponentially decayed integrals (recent time
+    weighs more), so availability = uptime / (uptime + downtime) adapts
+    without ever rescanning the transition log.
+    """
+
+    __slots__ = ('up', 'since', 'uptime', 'downtime', 'flaps', 'transitions', 'failures')
+
+    def __init__(self, up, now, history_size, prior=0.0):
+        self.up = up
+        self.since = now              # Time of the last accumulator update
+        # A link first seen up starts with a full window of prior uptime
+        self.uptime = prior if up else 0.0
+        self.downtime = 0.0
+        self.flaps = 0.0              # Decayed count of down transitions
+        self.failures = 0             # Total down transitions
+        self.transitions = deque([(now, up)], maxlen=history_size)
+
+    def accumulate(self, now, decay_rate):
+        """Fold the time since the last update into the decayed accumulators"""
+        elapsed = max(0.0, now - self.since)
+        decay = math.exp(-decay_rate * elapsed)
+        # Exact decayed integral of the constant current state over the interval
+        weight = (1.0 - decay) / decay_rate
+        self.uptime *= decay
+        self.downtime *= decay
+        self.flaps *= decay
+        if self.up:
+            self.uptime += weight
+        else:
+            self.downtime += weight
+        self.since = now
+
+    def availability(self, now, decay_rate) -> float:
+        """Decayed uptime / (uptime + downtime), without mutating the history"""
+        elapsed = max(0.0, now - self.since)
+        decay = math.exp(-decay_rate * elapsed)
+        weight = (1.0 - decay) / decay_rate
+        uptime = self.uptime * decay + (weight if self.up else 0.0)
+        downtime = self.downtime * decay + (0.0 if self.up else weight)
+        total = uptime + downtime
+        return uptime / total if total > 0 else (1.0 if self.up else 0.0)
+
+    def flap_rate(self, now, decay_rate) -> float:
+        """Recent down transitions per hour"""
+        decay = math.exp(-decay_rate * max(0.0, now - self.since))
+        # A decayed count over an exponential window of mean length 1/decay_rate
+        return self.flaps * decay * decay_rate * 3600.0
+
+
+class LinkStateTracker:
+    """
+    Transition history and reliability for every link RAVEN has seen
+
+    Args:
+        half_life: Seconds after which old up/down time counts half
+        history_size: Transitions kept per link (ring buffer)
+        flap_weight: Reliability penalty per flap/hour, R = A * exp(-w * flaps/h)
+        min_reliability: Floor for the reliability of a link that is up
+    """
+
+    def __init__(self, half_life=3600.0, history_size=32, flap_weight=0.05, min_reliability=0.1):
+        self.decay_rate = math.log(2) / half_life
+        self.history_size = history_size
+        self.flap_weight = flap_weight
+        self.min_reliability = min_reliability
+        self.links: Dict[Hashable, LinkHistory] = {}
+        self._failed = set()  # Links with at least one recorded failure
+
+    def record(self, link, up, now=None) -> bool:
+        """
+        Record the state of a link
+
+        Returns:
+            True if this was a transition (or the first sighting of the link)
+        """
+        now = time.time() if now is None else now
+        history = self.links.get(link)
+        if history is None:
+            self.links[link] = LinkHistory(up, now, self.history_size, prior=1.0 / self.decay_rate)
+            return True
+        if history.up == up:
+            return False
+
+        history.accumulate(now, self.decay_rate)
+        history.up = up
+        history.transitions.append((now, up))
+        if not up:
+            history.flaps += 1.0
+            history.failures += 1
+            self._failed.add(link)
+        return True
+
+    def apply_changes(self, changes, now=None) -> Tuple[set, set]:
+        """
+        Record the link transitions of a TopologyChangeSet
+
+        Removed edges went down (including links of removed devices), added
+        edges came up.
+
+        Returns:
+            (links that went down, links that came up)
+        """
+        now = time.time() if now is None else now
+        down = {link for link in changes.removed_edges if self.record(link, False, now)}
+        up = {link for link in changes.added_edges if self.record(link, True, now)}
+        return down, up
+
+    def reliability(self, link, now=None) -> float:
+        """
+        RAVEN link reliability R(l) = uptime / (uptime + downtime), damped by
+        the recent flap rate. Links without history are assumed perfect.
+        """
+        history = self.links.get(link)
+        if history is None:
+            return 1.0
+        now = time.time() if now is None else now
+        availability = history.availability(now, self.decay_rate)
+        flap_penalty = math.exp(-self.flap_weight * history.flap_rate(now, self.decay_rate))
+        return max(self.min_reliability, availability * flap_penalty)
+
+    def flapping_links(self) -> Iterable[Hashable]:
+        """Links with at least one recorded failure (the only ones whose reliability drifts)"""
+        return list(self._failed)
+
+    def get(self, link) -> Optional[LinkHistory]:
+        return self.links.get(link)
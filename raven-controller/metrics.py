@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Controller metrics for RAVEN
+Timing histograms, counters and gauges rendered in the Prometheus text
+format and served on /metrics; recording is a no-op until the registry is
+enabled, so an unscraped controller pays only an attribute check
+"""
+
+import bisect
+import functools
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, Response
+from werkzeug.serving import make_server
+
+logger = logging.getLogger(__name__)
+
+# Seconds, from sub-millisecond path searches to multi-second cycles
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _NullTimer:
+    """Timer handed out while the registry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Counter:
+    """Monotonic counter"""
+
+    kind = 'counter'
+
+    def __init__(self, registry, name, description):
+        self.registry = registry
+        self.name = name
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount=1):
+        if self.registry.enabled:
+            with self.registry.lock:
+                self.value += amount
+
+    def samples(self):
+        return [(self.name, {}, self.value)]
+
+
+class Gauge:
+    """
+    Current value, either set() by the code or read from fn at scrape time
+
+    Gauges backed by fn cost nothing between scrapes.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, registry, name, description, fn: Optional[Callable[[], float]] = None):
+        self.registry = registry
+        self.name = name
+        self.description = description
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value):
+        if self.registry.enabled:
+            self.value = value
+
+    def samples(self):
+        value = self.value
+        if self.fn is not None:
+            try:
+                value = self.fn()
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} failed: {e}")
+                value = math.nan
+        return [(self.name, {}, value)]
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds"""
+
+    kind = 'histogram'
+
+    def __init__(self, registry, name, description, buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.description = description
+        self.bounds = list(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.last = 0.0     # Most recent observation
+
+    def observe(self, value):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.bounds, value)
+        with self.registry.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+            self.last = value
+
+    def time(self):
+        """Context manager that observes the duration of its block"""
+        return _Timer(self) if self.registry.enabled else NULL_TIMER
+
+    def samples(self):
+        with self.registry.lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        samples = []
+        cumulative = 0
+        for bound, n in zip(self.bounds + [math.inf], counts):
+            cumulative += n
+            samples.append((f"{self.name}_bucket", {'le': _format_value(bound)}, cumulative))
+        samples.append((f"{self.name}_sum", {}, total))
+        samples.append((f"{self.name}_count", {}, count))
+        return samples
+
+
+# A collector returns (name, kind, description, [(labels, value), ...]) families at scrape time
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    """
+    Named metrics of one controller
+
+    Args:
+        enabled: Record observations (a disabled registry still renders, with
+            only the scrape-time gauges and collectors moving)
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, object] = {}
+        self.collectors: List[Collector] = []
+
+    def _register(self, metric):
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, description) -> Counter:
+        return self._register(Counter(self, name, description))
+
+    def gauge(self, name, description, fn=None) -> Gauge:
+        gauge = self._register(Gauge(self, name, description, fn))
+        if fn is not None:
+            gauge.fn = fn  # Re-registering rebinds the source (e.g. a new runtime's queues)
+        return gauge
+
+    def histogram(self, name, description, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, description, buckets))
+
+    def add_collector(self, collector: Collector):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(_format_sample(name, labels, value))
+
+        for collector in self.collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, description, samples in families:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(_format_sample(name, labels, value))
+        return '\n'.join(lines) + '\n'
+
+
+def timed(attribute):
+    """
+    Method decorator observing call durations into the Histogram at self.<attribute>
+
+    Calls go straight through while the histogram's registry is disabled.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            histogram = getattr(self, attribute)
+            if not histogram.registry.enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def endpoint_stats_families(stats: Dict[str, dict], prefix='raven_onos'):
+    """
+    Collector families for OnosClient.latency_stats()
+
+    Returns:
+        List of (name, kind, description, [(labels, value)])
+    """
+    def family(name, kind, description, field, scale=1.0):
+        samples = [({'endpoint': endpoint}, values[field] * scale) for endpoint, values in sorted(stats.items())]
+        return (f"{prefix}_{name}", kind, description, samples)
+
+    return [
+        family('requests_total', 'counter', 'ONOS REST requests', 'requests'),
+        family('errors_total', 'counter', 'ONOS REST requests that failed', 'errors'),
+        family('not_modified_total', 'counter', 'ONOS REST responses unchanged since the last request', 'not_modified'),
+        family('request_avg_seconds', 'gauge', 'Mean ONOS REST request latency', 'avg_ms', 0.001),
+        family('request_max_seconds', 'gauge', 'Slowest ONOS REST request', 'max_ms', 0.001),
+    ]
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value != value:
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_sample(name, labels, value):
+    if labels:
+        label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        return f"{name}{{{label_text}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsServer:
+    """
+    Serves a MetricsRegistry on GET /metrics from a background thread
+
+    Args:
+        registry: MetricsRegistry
+        port: TCP port (0 picks a free one)
+        host: Bind address
+    """
+
+    def __init__(self, registry: MetricsRegistry, port=9100, host='0.0.0.0'):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.app = Flask('raven-metrics')
+        self.app.add_url_rule('/metrics', 'metrics', self._metrics)
+        self._server = None
+
+    def _metrics(self):
+        return Response(self.registry.render(), mimetype=None, content_type=CONTENT_TYPE)
+
+    def start(self):
+        self._server = make_server(self.host, self.port, self.app, threaded=True)
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, name='raven-metrics', daemon=True).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Northbound REST API for RAVEN
+Serves selected paths and their scored candidates straight from the
+controller's memory, synchronous single-pair computation, and demand
+requests for demand-driven mode
+"""
+
+import logging
+import math
+import threading
+import time
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+from cycle_report import AmbiguousName
+from edge_metrics import batch_score
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    """Request error returned to the client as {"error": message}"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _number(value):
+    """JSON-safe float (inf/nan become None)"""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class NorthboundApi:
+    """
+    Read API over a RAVENController
+
+    Nodes are addressed by friendly name (h1, s3), MAC address or full ONOS
+    id; full host ids contain a slash, so pass them as ?src=&dst= query
+    parameters rather than in the path.
+
+    Reads never take the controller lock: they copy the dicts they iterate
+    and look entries up directly, so a long path cycle does not stall them.
+
+    Args:
+        controller: RAVENController
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.app = self._create_app()
+
+    # Queries
+
+    def resolve(self, name):
+        """ONOS node id for a friendly name, MAC or id"""
+        try:
+            node = self.controller.resolve_node(name)
+        except AmbiguousName:
+            raise ApiError(f"{name!r} matches several nodes; use the full node id", 409)
+        if node is None:
+            raise ApiError(f"unknown node {name!r}", 404)
+        return node
+
+    def candidates(self, src, dst, k=3, alpha=0.6, beta=0.4):
+        """
+        Scored candidates of a pair from the path cache, with host ends added
+
+        Returns:
+            (candidate dicts, cached entry version), or ([], None) if the pair
+            has no cached computation
+        """
+        controller = self.controller
+        route = controller.route_endpoints(src, dst)
+        reverse = False
+        cached = controller.path_cache.peek(controller.path_cache_key(*route, k, alpha, beta))
+        if cached is None:
+            cached = controller.path_cache.peek(controller.path_cache_key(route[1], route[0], k, alpha, beta))
+            reverse = cached is not None
+        if cached is None or not cached.candidates:
+            return [], None if cached is None else cached.version
+        paths = [path[::-1] if reverse else list(path) for path in cached.candidates]
+        if route != (src, dst):
+            paths = [[src] + path + [dst] for path in paths]
+        # Scored as full host-to-host paths, as the controller picks them.
+        # Not through score_paths, which would add API reads to the cycle's scoring histogram
+        metrics = controller.edge_metrics
+        reliability, bandwidth, scores = batch_score(metrics, *metrics.index_matrix(paths), alpha, beta)
+        best = int(scores.argmax())
+        return [{
+            'path': path,
+            'names': controller.format_path(path),
+            'reliability': _number(reliability[i]),
+            'bandwidth': _number(bandwidth[i]),
+            'hops': len(path) - 1,
+            'score': _number(scores[i]),
+            'best': i == best,
+        } for i, path in enumerate(paths)], cached.version
+
+    def pair(self, src, dst, k=3, alpha=0.6, beta=0.4):
+        """Selected path, backup and candidate breakdown of a pair"""
+        controller = self.controller
+        key = (src, dst)
+        if key not in controller.best_paths and (dst, src) in controller.best_paths:
+            key = (dst, src)  # Pairs are stored once, in host discovery order
+        if key not in controller.best_paths:
+            raise ApiError(f"no path computed for {controller.get_friendly_name(src)} -> "
+                           f"{controller.get_friendly_name(dst)}; POST /paths/compute to compute it", 404)
+        reverse = key != (src, dst)
+        path = controller.best_paths.get(key)
+        if path and reverse:
+            path = path[::-1]
+        backup = controller.backups.get(key)
+        candidates, computed_version = self.candidates(src, dst, k, alpha, beta)
+        score = controller.path_scores.get(key)
+        return {
+            'src': src,
+            'dst': dst,
+            'src_name': controller.get_friendly_name(src),
+            'dst_name': controller.get_friendly_name(dst),
+            'path': path,
+            'names': controller.format_path(path) if path else None,
+            'score': _number(score) if score is not None else None,
+            'backup': (backup.backup[::-1] if reverse else backup.backup) if backup is not None else None,
+            'changed_version': controller.path_versions.get(key),
+            'computed_version': computed_version,
+            'version': controller.version,
+            'candidates': candidates,
+        }
+
+    def paths(self, changed_since=None):
+        """Selected paths of all pairs, or of those changed after changed_since"""
+        controller = self.controller
+        versions = dict(controller.path_versions)
+        best_paths = dict(controller.best_paths)
+        scores = dict(controller.path_scores)
+        entries = []
+        for pair, path in best_paths.items():
+            changed = versions.get(pair)
+            if changed_since is not None and (changed is None or changed <= changed_since):
+                continue
+            score = scores.get(pair)
+            entries.append({
+                'src': pair[0],
+                'dst': pair[1],
+                'names': controller.format_path(path) if path else None,
+                'path': path,
+                'score': _number(score) if score is not None else None,
+                'changed_version': changed,
+            })
+        return {'version': controller.version, 'changed_since': changed_since, 'paths': entries}
+
+    def compute(self, src, dst, k=3, alpha=0.6, beta=0.4):
+        """Compute a pair now (served from the path cache when still valid)"""
+        controller = self.controller
+        with controller.lock:
+            if src not in controller.topology or dst not in controller.topology:
+                raise ApiError("source or destination not in topology", 404)
+            path = controller.compute_best_paths([(src, dst)], k, alpha, beta)[(src, dst)]
+            candidates, computed_version = self.candidates(src, dst, k, alpha, beta)
+        return {
+            'src': src,
+            'dst': dst,
+            'path': path,
+            'names': controller.format_path(path) if path else None,
+            'score': next((c['score'] for c in candidates if c['best']), None),
+            'computed_version': computed_version,
+            'version': controller.version,
+            'candidates': candidates,
+        }
+
+    def demand(self):
+        """Active demand pairs with seconds since their last traffic"""
+        controller = self.controller
+        now = time.monotonic()
+        last_seen = controller.demand.snapshot()
+        return {
+            'enabled': controller.demand_driven,
+            'idle_timeout': controller.demand.idle_timeout,
+            'pairs': [{'src': a, 'dst': b, 'names': f"{controller.get_friendly_name(a)} <-> {controller.get_friendly_name(b)}",
+                       'idle_seconds': now - seen} for (a, b), seen in last_seen.items()],
+        }
+
+    # REST
+
+    def _create_app(self):
+        app = Flask('raven-northbound')
+
+        @app.errorhandler(ApiError)
+        def api_error(e):
+            return jsonify({'error': str(e)}), e.status
+
+        def params(source):
+            try:
+                return {'k': int(source.get('k', 3)),
+                        'alpha': float(source.get('alpha', 0.6)),
+                        'beta': float(source.get('beta', 0.4))}
+            except (TypeError, ValueError) as e:
+                raise ApiError(f"invalid parameter: {e}")
+
+        @app.get('/paths')
+        def list_paths():
+            if 'src' in request.args or 'dst' in request.args:
+                return jsonify(self.pair(self.resolve(request.args.get('src', '')),
+                                         self.resolve(request.args.get('dst', '')), **params(request.args)))
+            changed_since = request.args.get('changed_since')
+            try:
+                changed_since = int(changed_since) if changed_since is not None else None
+            except ValueError:
+                raise ApiError("changed_since must be a version number")
+            return jsonify(self.paths(changed_since))
+
+        @app.get('/paths/<src>/<dst>')
+        def get_path(src, dst):
+            return jsonify(self.pair(self.resolve(src), self.resolve(dst), **params(request.args)))
+
+        @app.post('/paths/compute')
+        def compute_path():
+            body = request.get_json(silent=True) or {}
+            if 'src' not in body or 'dst' not in body:
+                raise ApiError("body must contain src and dst")
+            return jsonify(self.compute(self.resolve(body['src']), self.resolve(body['dst']), **params(body)))
+
+        @app.get('/demand')
+        def list_demand():
+            return jsonify(self.demand())
+
+        @app.post('/demand')
+        def add_demand():
+            body = request.get_json(silent=True) or {}
+            if 'src' not in body or 'dst' not in body:
+                raise ApiError("body must contain src and dst")
+            src, dst = self.resolve(body['src']), self.resolve(body['dst'])
+            if src == dst:
+                raise ApiError("src and dst must differ")
+            added = self.controller.request_demand(src, dst)
+            return jsonify({'src': src, 'dst': dst, 'added': added}), 201 if added else 200
+
+        @app.get('/report')
+        def report():
+            last = self.controller.last_report
+            return jsonify(last.to_dict(self.controller.report_top_n) if last is not None else None)
+
+        return app
+
+
+class NorthboundServer:
+    """
+    Serves a NorthboundApi from a background thread
+
+    Args:
+        controller: RAVENController
+        port: TCP port (0 picks a free one)
+        host: Bind address
+    """
+
+    def __init__(self, controller, port=8081, host='0.0.0.0'):
+        self.api = NorthboundApi(controller)
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        self._server = make_server(self.host, self.port, self.api.app, threaded=True)
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, name='raven-northbound', daemon=True).start()
+        logger.info(f"Serving the northbound API on http://{self.host}:{self.port}/paths")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Shared ONOS REST client
+Pooled keep-alive session, parallel topology fetches, ETag/content change
+detection and per-endpoint latency metrics
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+TOPOLOGY_ENDPOINTS = ('devices', 'links', 'hosts')
+
+
+class EndpointStats:
+    """Latency counters for one REST endpoint"""
+
+    __slots__ = ('requests', 'errors', 'not_modified', 'total_time', 'max_time', 'last_time')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0   # Responses detected as unchanged (304 or identical body)
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def record(self, elapsed, error=False, not_modified=False):
+        self.requests += 1
+        self.errors += int(error)
+        self.not_modified += int(not_modified)
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.last_time = elapsed
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'not_modified': self.not_modified,
+            'avg_ms': (self.total_time / self.requests * 1000) if self.requests else 0.0,
+            'max_ms': self.max_time * 1000,
+            'last_ms': self.last_time * 1000,
+        }
+
+
+class OnosClient:
+    """
+    ONOS REST client shared by the controller and the analysis scripts
+
+    Args:
+        onos_url: ONOS base URL (e.g. http://onos:8181)
+        auth: (username, password)
+        timeout: Per-request timeout in seconds
+        pool_size: Keep-alive connections kept open to ONOS
+        max_workers: Threads used for parallel fetches
+    """
+
+    def __init__(self, onos_url="http://onos:8181", auth=("onos", "rocks"), timeout=5,
+                 pool_size=10, max_workers=4):
+        self.base_url = f"{onos_url.rstrip('/')}/onos/v1"
+        self.auth = auth
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.auth = auth
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='onos-rest')
+        self._lock = threading.Lock()
+        self._etags: Dict[str, str] = {}
+        self._digests: Dict[str, str] = {}
+        self._bodies: Dict[str, dict] = {}
+        self._changed: Dict[str, bool] = {}
+        self.stats: Dict[str, EndpointStats] = {}
+
+    def url(self, endpoint):
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def get(self, endpoint, params=None) -> dict:
+        """
+        GET an endpoint and return its JSON body
+
+        Sends If-None-Match when ONOS gave an ETag last time; a 304 or an
+        identical body marks the endpoint as unchanged (see changed()).
+        """
+        headers = {}
+        etag = self._etags.get(endpoint)
+        if etag:
+            headers['If-None-Match'] = etag
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(self.url(endpoint), params=params, headers=headers,
+                                        timeout=self.timeout)
+            if response.status_code == 304 and endpoint in self._bodies:
+                self._record(endpoint, time.perf_counter() - start, not_modified=True)
+                self._changed[endpoint] = False
+                return self._bodies[endpoint]
+
+            response.raise_for_status()
+            digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+            body = response.json()
+        except Exception:
+            self._record(endpoint, time.perf_counter() - start, error=True)
+            raise
+
+        unchanged = self._digests.get(endpoint) == digest
+        self._record(endpoint, time.perf_counter() - start, not_modified=unchanged)
+        self._changed[endpoint] = not unchanged
+        self._digests[endpoint] = digest
+        self._bodies[endpoint] = body
+        if response.headers.get('ETag'):
+            self._etags[endpoint] = response.headers['ETag']
+        return body
+
+    def post(self, endpoint, json=None, params=None) -> requests.Response:
+        """POST JSON to an endpoint and return the raw response"""
+        start = time.perf_counter()
+        try:
+            response = self.session.post(self.url(endpoint), json=json, params=params, timeout=self.timeout)
+        except Exception:
+            self._record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        self._record(endpoint, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+    def delete(self, endpoint, json=None) -> requests.Response:
+        """DELETE an endpoint and return the raw response"""
+        start = time.perf_counter()
+        try:
+            response = self.session.delete(self.url(endpoint), json=json, timeout=self.timeout)
+        except Exception:
+            self._record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        self._record(endpoint, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+    def get_many(self, endpoints) -> List[dict]:
+        """GET several endpoints in parallel, returning bodies in the same order"""
+        futures = [self._executor.submit(self.get, endpoint) for endpoint in endpoints]
+        return [future.result() for future in futures]
+
+    def get_topology(self):
+        """
+        Fetch devices, links and hosts in parallel
+
+        Returns:
+            (devices, links, hosts) lists
+        """
+        devices, links, hosts = self.get_many(TOPOLOGY_ENDPOINTS)
+        return devices.get('devices', []), links.get('links', []), hosts.get('hosts', [])
+
+    def changed(self, *endpoints) -> bool:
+        """True if any endpoint's last response differed from the one before it"""
+        endpoints = endpoints or TOPOLOGY_ENDPOINTS
+        return any(self._changed.get(endpoint, True) for endpoint in endpoints)
+
+    def latency_stats(self) -> Dict[str, dict]:
+        """Per-endpoint request counts and latencies"""
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in self.stats.items()}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _record(self, endpoint, elapsed, error=False, not_modified=False):
+        # Group per-device paths such as flows/of:0000000000000001 under 'flows'
+        key = endpoint.split('/')[0]
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = EndpointStats()
+            stats.record(elapsed, error, not_modified)
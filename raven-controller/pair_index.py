@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Edge-to-pairs reverse index for RAVEN
+Maps integer edge ids to the host pairs whose selected or candidate paths
+use them, so a link event finds its dependent pairs without scanning paths
+"""
+
+import logging
+from typing import Dict, Hashable, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class EdgePairIndex:
+    """
+    edge id -> pairs, kept in step with the paths of each pair
+
+    update() diffs a pair's old and new edge sets, so re-indexing a pair
+    whose paths did not change touches nothing.
+    """
+
+    def __init__(self):
+        self.pairs_by_edge: Dict[int, Set[Hashable]] = {}
+        self.edges_by_pair: Dict[Hashable, Set[int]] = {}
+
+    def __len__(self):
+        return len(self.edges_by_pair)
+
+    def __contains__(self, pair):
+        return pair in self.edges_by_pair
+
+    def update(self, pair, edge_ids: Iterable[int]):
+        """Set the edges a pair depends on"""
+        new = set(edge_ids)
+        new.discard(None)
+        old = self.edges_by_pair.get(pair, set())
+
+        for eid in old - new:
+            pairs = self.pairs_by_edge.get(eid)
+            if pairs is not None:
+                pairs.discard(pair)
+                if not pairs:
+                    del self.pairs_by_edge[eid]
+        for eid in new - old:
+            self.pairs_by_edge.setdefault(eid, set()).add(pair)
+
+        if new:
+            self.edges_by_pair[pair] = new
+        else:
+            self.edges_by_pair.pop(pair, None)
+
+    def remove(self, pair):
+        self.update(pair, ())
+
+    def pairs_for(self, edge_ids: Iterable[int]) -> Set[Hashable]:
+        """Pairs whose selected or candidate paths use any of edge_ids"""
+        pairs = set()
+        for eid in edge_ids:
+            pairs |= self.pairs_by_edge.get(eid, set())
+        return pairs
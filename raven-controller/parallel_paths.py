@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Parallel path engine for RAVEN
+Shards (src, dst) pairs across a process pool. Each worker loads the
+graph/metrics snapshot once per topology version and reuses it for every
+shard it receives.
+"""
+
+import logging
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from candidate_paths import k_shortest_paths
+from edge_metrics import batch_score, best_per_group
+
+logger = logging.getLogger(__name__)
+
+# Per-process snapshot cache: (version, snapshot dict)
+_worker_snapshot: Tuple[Optional[int], Optional[dict]] = (None, None)
+
+
+def _load_snapshot(version, path) -> dict:
+    global _worker_snapshot
+    if _worker_snapshot[0] != version:
+        with open(path, 'rb') as f:
+            _worker_snapshot = (version, pickle.load(f))
+    return _worker_snapshot[1]
+
+
+def compute_shard(version, snapshot_path, pairs, k, alpha, beta):
+    """
+    Worker entry point: best paths for a shard of pairs
+
+    Returns:
+        List of (pair, candidates, best index or -1, best score)
+    """
+    snapshot = _load_snapshot(version, snapshot_path)
+    return score_pairs(snapshot, pairs, k, alpha, beta)
+
+
+def score_pairs(snapshot, pairs, k, alpha, beta):
+    """Candidate generation and batch scoring for pairs against a snapshot"""
+    import networkx as nx
+
+    graph = snapshot['graph']
+    metrics = snapshot['metrics']
+    found = []
+    results = []
+    for src, dst in pairs:
+        try:
+            paths = k_shortest_paths(graph, src, dst, k, max_hops=snapshot['max_hops'],
+                                     time_budget=snapshot['time_budget'])
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            paths = []
+        if paths:
+            found.append(((src, dst), paths))
+        else:
+            results.append(((src, dst), [], -1, float('-inf')))
+
+    if found:
+        all_paths = [path for _, paths in found for path in paths]
+        matrix, hops = metrics.index_matrix(all_paths)
+        _, _, scores = batch_score(metrics, matrix, hops, alpha, beta)
+        best_rows = best_per_group(scores, [len(paths) for _, paths in found])
+        offset = 0
+        for (pair, paths), best_row in zip(found, best_rows):
+            results.append((pair, paths, int(best_row) - offset, float(scores[best_row])))
+            offset += len(paths)
+    return results
+
+
+class ParallelPathEngine:
+    """
+    Computes best paths for many pairs on a ProcessPoolExecutor
+
+    Args:
+        workers: Number of worker processes
+        shard_size: Pairs per task (None = split evenly, a few shards per worker)
+    """
+
+    def __init__(self, workers=None, shard_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self._executor = None
+        self._snapshot_version = None
+        self._snapshot_path = None
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def publish(self, version, graph, metrics, max_hops=None, time_budget=None):
+        """Write the snapshot for a topology/metrics version (once per version)"""
+        if version == self._snapshot_version:
+            return
+        fd, path = tempfile.mkstemp(prefix=f"raven-snapshot-{version}-", suffix=".pkl")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'graph': graph, 'metrics': metrics, 'max_hops': max_hops,
+                         'time_budget': time_budget}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        old_path = self._snapshot_path
+        self._snapshot_version, self._snapshot_path = version, path
+        if old_path:
+            # Workers already holding the old version keep it in memory
+            try:
+                os.unlink(old_path)
+            except OSError:
+                pass
+
+    def compute(self, pairs, k=3, alpha=0.6, beta=0.4) -> List[Tuple]:
+        """
+        Best paths for pairs against the published snapshot
+
+        Returns:
+            List of (pair, candidates, best index or -1, best score)
+        """
+        if self._snapshot_path is None:
+            raise RuntimeError("publish() a snapshot before compute()")
+        pairs = list(pairs)
+        if not pairs:
+            return []
+
+        shard_size = self.shard_size or max(1, -(-len(pairs) // (self.workers * 4)))
+        shards = [pairs[i:i + shard_size] for i in range(0, len(pairs), shard_size)]
+        executor = self._ensure_executor()
+        futures = [executor.submit(compute_shard, self._snapshot_version, self._snapshot_path,
+                                   shard, k, alpha, beta) for shard in shards]
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._snapshot_path:
+            try:
+                os.unlink(self._snapshot_path)
+            except OSError:
+                pass
+            self._snapshot_path = None
+            self._snapshot_version = None
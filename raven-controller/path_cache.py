@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Path cache for RAVEN path selection
+Keeps the k candidates and the chosen best path per (src, dst, scoring
+parameters), invalidated per edge when the topology or link metrics change
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from topology_diff import path_edges
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPaths:
+    """Cached result of one path computation"""
+
+    __slots__ = ('candidates', 'best_path', 'best_score', 'version', 'edges')
+
+    def __init__(self, candidates, best_path, best_score, version):
+        self.candidates: List[List] = candidates
+        self.best_path: Optional[List] = best_path
+        self.best_score: float = best_score
+        self.version: int = version  # Topology/metrics version the entry was computed against
+        self.edges: Set[Tuple] = {e for path in candidates for e in path_edges(path)}
+
+
+class PathCache:
+    """
+    LRU cache of RAVEN path computations
+
+    Keys are tuples starting with (src, dst, ...) followed by the scoring
+    parameters. An edge -> keys index allows invalidating only the entries
+    whose candidate paths traverse a changed edge.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedPaths]" = OrderedDict()
+        self._edge_index: Dict[Tuple, Set[Hashable]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key) -> Optional[CachedPaths]:
+        """Return the cached entry for key (and mark it recently used), or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def peek(self, key) -> Optional[CachedPaths]:
+        """Return the cached entry without touching LRU order or counters"""
+        return self._entries.get(key)
+
+    def put(self, key, candidates, best_path, best_score, version) -> CachedPaths:
+        """Store a computation result, evicting least recently used entries beyond max_entries"""
+        if key in self._entries:
+            self._remove(key)
+
+        entry = CachedPaths(candidates, best_path, best_score, version)
+        self._entries[key] = entry
+        for edge in entry.edges:
+            self._edge_index.setdefault(edge, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+        return entry
+
+    def invalidate_edges(self, edges: Iterable[Tuple]) -> Set[Hashable]:
+        """
+        Drop every entry whose candidate paths traverse one of the edges
+
+        Args:
+            edges: Canonical edge keys (see topology_diff.edge_key)
+
+        Returns:
+            Keys of the dropped entries
+        """
+        dropped = set()
+        for edge in edges:
+            dropped.update(self._edge_index.get(edge, ()))
+
+        for key in dropped:
+            self._remove(key)
+        self.invalidations += len(dropped)
+        return dropped
+
+    def invalidate_nodes(self, nodes: Iterable) -> Set[Hashable]:
+        """Drop every entry whose src or dst is one of the nodes"""
+        nodes = set(nodes)
+        dropped = {key for key in self._entries if key[0] in nodes or key[1] in nodes}
+        for key in dropped:
+            self._remove(key)
+        self.invalidations += len(dropped)
+        return dropped
+
+    def clear(self):
+        """Drop every entry (counted as invalidations)"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._edge_index.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for logging/monitoring"""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        for edge in entry.edges:
+            keys = self._edge_index.get(edge)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._edge_index[edge]
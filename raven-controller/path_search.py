@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Single-source RAVEN path search
+Finds reliability/bandwidth-aware paths from one source to many destinations
+in one traversal instead of one search per pair, either best-first with
+early exit or level by level through complete Pareto fronts
+"""
+
+import heapq
+import itertools
+import logging
+import math
+from typing import Dict, Hashable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MIN_RELIABILITY = 1e-300  # Keeps log-reliability finite for dead links
+
+
+class Label:
+    """
+    A partial path ending at node, linked to its predecessor label
+
+    log_reliability is additive along the path, bandwidth is the bottleneck
+    (widest-path) value and hops the path length.
+    """
+
+    __slots__ = ('node', 'log_reliability', 'bandwidth', 'hops', 'parent')
+
+    def __init__(self, node, log_reliability, bandwidth, hops, parent=None):
+        self.node = node
+        self.log_reliability = log_reliability
+        self.bandwidth = bandwidth
+        self.hops = hops
+        self.parent = parent
+
+    def extend(self, node, reliability, bandwidth) -> 'Label':
+        return Label(node, self.log_reliability + math.log(max(reliability, MIN_RELIABILITY)),
+                     min(self.bandwidth, bandwidth), self.hops + 1, self)
+
+    def visits(self, node) -> bool:
+        label = self
+        while label is not None:
+            if label.node == node:
+                return True
+            label = label.parent
+        return False
+
+    def path(self) -> List[Hashable]:
+        nodes = []
+        label = self
+        while label is not None:
+            nodes.append(label.node)
+            label = label.parent
+        return nodes[::-1]
+
+    def score(self, alpha, beta, max_bandwidth, hop_weight=0.1) -> float:
+        """RAVEN objective of the labelled path (same formula as batch_score)"""
+        return (alpha * math.exp(self.log_reliability) + beta * (self.bandwidth / max_bandwidth)
+                - hop_weight * self.hops)
+
+
+def link_metrics(metrics, u, v):
+    """(reliability, bandwidth) of link (u, v) from an EdgeMetricStore"""
+    eid = metrics.edge_id(u, v)
+    if eid is None:
+        eid = metrics.path_edge_ids([u, v])[0]
+    return metrics.reliability[eid], metrics.bandwidth[eid]
+
+
+def is_transit(graph, node, source) -> bool:
+    """Hosts terminate paths; only switches (and the source) are expanded"""
+    return node == source or graph.nodes[node].get('type') != 'host'
+
+
+def single_source_paths(graph, metrics, source, targets: Optional[Iterable] = None, k=1,
+                        alpha=0.6, beta=0.4, max_bandwidth=None, hop_weight=0.1,
+                        max_hops=None) -> Dict[Hashable, List[List]]:
+    """
+    Best RAVEN-scored paths from source to every target in one sweep
+
+    A best-first search on the RAVEN score. Extending a path never raises its
+    score (reliability multiplies by R <= 1, the bottleneck can only shrink,
+    hops grow), so every prefix of a path is popped before the path itself
+    and targets are reached best path first. The score does not decompose
+    per node, so a node is not settled by its first label: a popped label is
+    only dropped when a label already expanded at the same node dominates
+    it on (reliability, bandwidth, hops), as in pareto_paths. The result is
+    exact, and the search stops as soon as every target has k paths.
+
+    Args:
+        graph: Topology graph
+        metrics: EdgeMetricStore with per-link reliability and bandwidth
+        source: Start node
+        targets: Nodes to find paths to (None = every reachable node)
+        k: Paths kept per target
+        max_bandwidth: Bandwidth normalization in Mbps (None = metrics.max_bandwidth)
+        max_hops: Maximum path length (None = no limit)
+
+    Returns:
+        Dict of target -> up to k simple paths, best first
+    """
+    if max_bandwidth is None:
+        max_bandwidth = metrics.max_bandwidth
+    remaining = None if targets is None else set(targets) - {source}
+    expanded: Dict[Hashable, List[Label]] = {}
+    found: Dict[Hashable, List[List]] = {}
+    counter = itertools.count()  # Tie breaker: earlier labels first
+
+    start = Label(source, 0.0, math.inf, 0)
+    heap = [(-math.inf, next(counter), start)]
+    while heap:
+        _, _, label = heapq.heappop(heap)
+        node = label.node
+        # Loops are dominated too: the earlier visit has fewer hops and no worse metrics
+        labels = expanded.setdefault(node, [])
+        if any(dominates(other, label) for other in labels):
+            continue
+        labels.append(label)
+
+        if node != source and len(found.get(node, ())) < k and (remaining is None or node in remaining):
+            found.setdefault(node, []).append(label.path())
+            if remaining is not None and len(found[node]) >= k:
+                remaining.discard(node)
+                if not remaining:
+                    break
+
+        if not is_transit(graph, node, source) or (max_hops is not None and label.hops >= max_hops):
+            continue
+        for neighbor in graph.neighbors(node):
+            reliability, bandwidth = link_metrics(metrics, node, neighbor)
+            extended = label.extend(neighbor, reliability, bandwidth)
+            if any(dominates(other, extended) for other in expanded.get(neighbor, ())):
+                continue
+            heapq.heappush(heap, (-extended.score(alpha, beta, max_bandwidth, hop_weight),
+                                  next(counter), extended))
+
+    return found
+
+
+def dominates(a: Label, b: Label, log_slack=0.0, bandwidth_slack=1.0) -> bool:
+    """
+    True if label a is at least as good as b on every criterion
+
+    With slack (epsilon-dominance), a may be worse by a factor of
+    (1 + epsilon) on reliability and bandwidth and still dominate.
+    """
+    return (a.hops <= b.hops
+            and a.log_reliability + log_slack >= b.log_reliability
+            and a.bandwidth * bandwidth_slack >= b.bandwidth)
+
+
+def pareto_paths(graph, metrics, source, targets: Optional[Iterable] = None, k=1,
+                 alpha=0.6, beta=0.4, max_bandwidth=None, hop_weight=0.1,
+                 max_hops=None, epsilon=0.0) -> Dict[Hashable, List[List]]:
+    """
+    Score-maximizing RAVEN paths from source via multi-criteria label setting
+
+    Labels are (log-reliability, bottleneck bandwidth, hops) and are expanded
+    one hop level at a time. A label dominated by another label at the same
+    node is pruned: any extension of it is dominated by the same extension
+    of the dominating label. The RAVEN score increases with reliability and
+    bandwidth and decreases with hops, so the best path to each target is on
+    its Pareto front, and the result is exact for epsilon = 0.
+
+    With epsilon > 0 a label is also pruned when another is within a factor
+    of (1 + epsilon) on reliability and bandwidth, which bounds the front
+    size on large graphs at the cost of a bounded loss in those criteria.
+
+    Args:
+        graph: Topology graph
+        metrics: EdgeMetricStore with per-link reliability and bandwidth
+        source: Start node
+        targets: Nodes to find paths to (None = every reachable node)
+        k: Paths kept per target (best scores on its front)
+        max_bandwidth: Bandwidth normalization in Mbps (None = metrics.max_bandwidth)
+        max_hops: Maximum path length (None = no limit)
+        epsilon: Dominance slack (0 = exact)
+
+    Returns:
+        Dict of target -> up to k paths, best first
+    """
+    if max_bandwidth is None:
+        max_bandwidth = metrics.max_bandwidth
+    log_slack = math.log1p(epsilon)
+    bandwidth_slack = 1.0 + epsilon
+    fronts: Dict[Hashable, List[Label]] = {source: [Label(source, 0.0, math.inf, 0)]}
+    frontier = fronts[source]
+    hops = 0
+
+    while frontier and (max_hops is None or hops < max_hops):
+        hops += 1
+        level: Dict[Hashable, List[Label]] = {}
+        for label in frontier:
+            if not is_transit(graph, label.node, source):
+                continue
+            for neighbor in graph.neighbors(label.node):
+                reliability, bandwidth = link_metrics(metrics, label.node, neighbor)
+                extended = label.extend(neighbor, reliability, bandwidth)
+                # Settled labels from earlier levels, then this level's
+                if any(dominates(other, extended, log_slack, bandwidth_slack)
+                       for other in fronts.get(neighbor, ())):
+                    continue
+                current = level.setdefault(neighbor, [])
+                if any(dominates(other, extended, log_slack, bandwidth_slack) for other in current):
+                    continue
+                current[:] = [other for other in current if not dominates(extended, other)]
+                current.append(extended)
+
+        frontier = []
+        for node, labels in level.items():
+            fronts.setdefault(node, []).extend(labels)
+            frontier.extend(labels)
+
+    wanted = fronts.keys() if targets is None else targets
+    found = {}
+    for target in wanted:
+        if target == source or target not in fronts:
+            continue
+        labels = sorted(fronts[target], key=lambda l: -l.score(alpha, beta, max_bandwidth, hop_weight))
+        found[target] = [label.path() for label in labels[:k]]
+    return found
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Port map for RAVEN flow installation
+Maintains the (device, neighbor) -> output port index from ONOS links and
+host locations
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def ports_from_onos(links, hosts) -> Dict[Tuple[str, str], str]:
+    """
+    Derive (device, neighbor) -> port entries from ONOS REST payloads
+
+    Switch links give the port on each end (src.port towards dst, dst.port
+    towards src); host locations give the switch port facing the host.
+    """
+    ports = {}
+    for link in links:
+        if link.get('state') != 'ACTIVE':
+            continue
+        src, dst = link['src'], link['dst']
+        ports.setdefault((src['device'], dst['device']), str(src['port']))
+        ports.setdefault((dst['device'], src['device']), str(dst['port']))
+
+    for host in hosts:
+        for location in host.get('locations', []):
+            if 'port' in location:
+                ports.setdefault((location['elementId'], host['id']), str(location['port']))
+
+    return ports
+
+
+class PortMap:
+    """(device, neighbor) -> output port, kept in step with the topology"""
+
+    def __init__(self):
+        self.ports: Dict[Tuple[str, str], str] = {}
+
+    def __len__(self):
+        return len(self.ports)
+
+    def get(self, device_id, neighbor) -> Optional[str]:
+        """Port on device_id that leads to neighbor, or None if unknown"""
+        return self.ports.get((device_id, neighbor))
+
+    def update(self, links, hosts) -> int:
+        """
+        Apply a topology snapshot, touching only entries that changed
+
+        Returns:
+            Number of entries added, changed or removed
+        """
+        fresh = ports_from_onos(links, hosts)
+        changed = 0
+
+        for key in [k for k in self.ports if k not in fresh]:
+            del self.ports[key]
+            changed += 1
+
+        for key, port in fresh.items():
+            if self.ports.get(key) != port:
+                self.ports[key] = port
+                changed += 1
+
+        if changed:
+            logger.debug(f"Port map: {changed} entries updated, {len(self.ports)} total")
+        return changed
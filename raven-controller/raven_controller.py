@@ -4,121 +4,382 @@ RAVEN (Reliability-Aware Virtual Network Embedding) Controller
 This controller monitors ONOS topology and implements RAVEN path selection
 """
 
-import requests
+import os
 import json
+import asyncio
+import threading
 import time
 import logging
 from typing import List, Dict, Tuple
 import networkx as nx
+import numpy as np
+
+from async_runtime import AsyncRavenRuntime
+from backup_paths import BackupPathStore, disjoint_backup
+from candidate_paths import k_shortest_paths
+from cycle_report import CycleReport, FriendlyNameTable
+from demand import DEMAND_SOURCES, DemandTracker
+from edge_metrics import EdgeMetricStore, batch_score, best_per_group, raven_score
+from failover_groups import BACKUP_FLOW_PRIORITY, FailoverGroup, FailoverGroupManager
+from flow_batcher import FlowBatcher, FlowRule, RAVEN_FLOW_PRIORITY
+from flow_store import FlowStore
+from onos_client import OnosClient
+from pair_index import EdgePairIndex
+from link_history import LinkStateTracker
+from metrics import MetricsRegistry, MetricsServer, endpoint_stats_families, timed
+from northbound import NorthboundServer
+from parallel_paths import ParallelPathEngine
+from path_cache import PathCache
+from path_search import pareto_paths, single_source_paths
+from port_map import PortMap
+from telemetry import PortStatsCollector, TelemetryLoop
+from topology_diff import TopologyChangeSet, apply_topology_diff, edge_key
+from topology_events import AdaptivePoller, EventStreamUnavailable, TopologySnapshot, event_source_from_url
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class RAVENController:
-    def __init__(self, onos_url="http://onos:8181", username="onos", password="rocks"):
+    def __init__(self, onos_url="http://onos:8181", username="onos", password="rocks",
+                 max_hops=None, path_time_budget=None, path_cache_size=10000,
+                 event_source=None, poll_min_interval=1.0, poll_max_interval=10.0, resync_interval=60.0,
+                 install_flows=False, flow_batch_size=200, directed_metrics=False,
+                 stats_interval=5.0, default_capacity=100.0, max_bandwidth=None, bandwidth_change_threshold=1.0,
+                 reliability_half_life=3600.0, path_workers=0, parallel_min_pairs=256,
+                 aggregate_hosts=True, path_search='k_shortest', pareto_epsilon=0.0,
+                 backup_paths=False, backup_node_disjoint=True, fast_failover=False, metrics_port=None,
+                 report_top_n=5, api_port=None, demand_driven=False, demand_idle_timeout=300.0,
+                 demand_interval=5.0, demand_sources=('flows', 'intents')):
         self.onos_url = onos_url
         self.auth = (username, password)
+        self.onos = OnosClient(onos_url, self.auth)  # Pooled keep-alive REST session
+        self.port_map = PortMap()   # (device, neighbor) -> output port
+        # Link reliability, bandwidth and failure history, indexed by integer edge id
+        self.edge_metrics = EdgeMetricStore(directed=directed_metrics, default_bandwidth=default_capacity,
+                                            max_bandwidth=max_bandwidth or default_capacity)
+        self.link_history = LinkStateTracker(half_life=reliability_half_life)  # Up/down transitions per link
         self.topology = nx.Graph()
-        self.link_reliability = {}  # Track link reliability scores
-        self.link_bandwidth = {}    # Track available bandwidth
-        self.link_failures = {}     # Track failure history
+        self.best_paths = {}        # (src, dst) -> best path from the last computation (None = no path)
+        self.max_hops = max_hops                  # Hop cutoff for candidate paths (None = no limit)
+        self.path_time_budget = path_time_budget  # Seconds allowed per pair for candidate search
+        self.path_cache = PathCache(max_entries=path_cache_size)
+        self.version = 0            # Bumped on every topology or link metric change
+        self.snapshot = TopologySnapshot()        # Last known ONOS device/link/host lists
+        self.event_source = event_source          # Pushes topology events (None = polling only)
+        self.poll_min_interval = poll_min_interval
+        self.poll_max_interval = poll_max_interval
+        self.resync_interval = resync_interval    # Full REST resync period while streaming
+        self.install_flows = install_flows        # Push selected paths to ONOS as flow rules
+        self.flow_batch_size = flow_batch_size    # Flows per bulk POST /flows request
+        self.flow_store = FlowStore(self.onos, batch_size=flow_batch_size)  # Installed vs desired flows
+        self.stats_interval = stats_interval      # Seconds between port statistics pulls (0 = off)
+        self.default_capacity = default_capacity  # Mbps assumed when ONOS reports no port speed
+        self.max_bandwidth = max_bandwidth        # Mbps scored as a full bandwidth term (None = fastest known link)
+        self.port_stats = PortStatsCollector(self.onos)  # Port speeds and smoothed tx/rx rates
+        self.bandwidth_change_threshold = bandwidth_change_threshold  # Mbps change that triggers re-scoring
+        self.telemetry = None
+        # Process pool for large recomputations (None = compute in-process)
+        self.path_engine = ParallelPathEngine(workers=path_workers) if path_workers > 1 else None
+        self.parallel_min_pairs = parallel_min_pairs  # Uncached pairs needed before using the pool
+        self.aggregate_hosts = aggregate_hosts    # Compute once per switch pair, fan out to hosts
+        # Candidate search: 'k_shortest' (per pair), 'sweep' (best-first per source) or 'exact' (Pareto fronts)
+        self.path_search = path_search
+        self.pareto_epsilon = pareto_epsilon      # Dominance slack for 'exact' (0 = exact optimum)
+        self.backup_paths = backup_paths          # Precompute a disjoint backup for every selected path
+        self.backup_node_disjoint = backup_node_disjoint  # Backups avoid primary switches, not only links
+        self.backups = BackupPathStore()
+        self.fast_failover = fast_failover        # Pre-install backups as OpenFlow fast-failover groups
+        self.failover_groups = FailoverGroupManager(self.onos)
+        self.pending_flows = {}                   # pair -> flow rules staged for the next flow sync
+        self.pending_groups = {}                  # pair -> failover groups staged for the next sync
+        self.pair_index = EdgePairIndex()         # Edge id -> host pairs whose paths use it
+        self.dirty_pairs = set()                  # Pairs hit by link metric changes since the last cycle
+        self.lock = threading.RLock()             # Serializes graph/metric updates across threads
+        self.friendly_names = FriendlyNameTable() # Node id -> s3/h5, rebuilt when nodes change
+        self.path_scores = {}                     # (src, dst) -> RAVEN score of the selected path
+        self.path_versions = {}                   # (src, dst) -> version at which the selected path last changed
+        self.report_top_n = report_top_n          # Path changes listed in each cycle report
+        self.last_report = None                   # CycleReport of the last update_paths
+        self.metrics_port = metrics_port          # Port serving /metrics (None = no endpoint, no recording)
+        self.metrics = MetricsRegistry(enabled=metrics_port is not None)
+        self.metrics_server = None
+        self.api_port = api_port                  # Port serving the northbound /paths API (None = off)
+        self.api_server = None
+        # Demand-driven mode: only host pairs seen exchanging traffic get paths and flows
+        self.demand_driven = demand_driven
+        self.demand = DemandTracker(idle_timeout=demand_idle_timeout)
+        self.demand_interval = demand_interval    # Seconds between demand source polls
+        self.demand_sources = [DEMAND_SOURCES[name](self.onos) for name in demand_sources] if demand_driven else []
+        self.demand_polled_at = 0.0
+        self.wakeup = threading.Event()           # Set to cut the monitoring loop's sleep short
+        self.init_metrics()
+        
+    def init_metrics(self):
+        """Register the controller's timing histograms, counters and scrape-time gauges"""
+        m = self.metrics
+        self.topology_fetch_seconds = m.histogram('raven_topology_fetch_seconds', 'ONOS devices/links/hosts fetch time')
+        self.build_graph_seconds = m.histogram('raven_build_graph_seconds', 'Topology diff and graph update time')
+        self.candidate_paths_seconds = m.histogram('raven_candidate_paths_seconds', 'k-shortest candidate search time per pair')
+        self.candidate_sweep_seconds = m.histogram('raven_candidate_sweep_seconds', 'Single-source candidate search time per batch')
+        self.scoring_seconds = m.histogram('raven_scoring_seconds', 'Vectorized path scoring time per batch')
+        self.best_paths_seconds = m.histogram('raven_best_paths_seconds', 'Best path computation time per batch of pairs')
+        self.find_best_path_seconds = m.histogram('raven_find_best_path_seconds', 'find_best_path_raven time')
+        self.flow_install_seconds = m.histogram('raven_flow_install_seconds', 'Direct flow rule install time per call')
+        self.flow_sync_seconds = m.histogram('raven_flow_sync_seconds', 'Staged flow and group reconciliation time')
+        self.cycle_seconds = m.histogram('raven_cycle_seconds', 'Path update cycle time')
+        self.pairs_recomputed = m.counter('raven_pairs_recomputed_total', 'Host pairs whose paths were recomputed')
+        self.pairs_failed_over = m.counter('raven_pairs_failed_over_total', 'Host pairs moved onto precomputed backups')
         
+        m.gauge('raven_last_cycle_seconds', 'Duration of the last path update cycle', fn=lambda: self.cycle_seconds.last)
+        m.gauge('raven_topology_version', 'Topology and link metric version', fn=lambda: self.version)
+        m.gauge('raven_host_pairs', 'Host pairs with a computed path', fn=lambda: len(self.best_paths))
+        m.gauge('raven_dirty_pairs', 'Pairs waiting for re-scoring after link metric changes', fn=lambda: len(self.dirty_pairs))
+        m.gauge('raven_pending_flow_pairs', 'Pairs with flow rules staged for the next sync', fn=lambda: len(self.pending_flows))
+        m.gauge('raven_pending_group_pairs', 'Pairs with failover groups staged for the next sync', fn=lambda: len(self.pending_groups))
+        m.gauge('raven_path_cache_entries', 'Entries in the path cache', fn=lambda: len(self.path_cache))
+        m.gauge('raven_active_demand_pairs', 'Host pairs with recent traffic (demand-driven mode)', fn=lambda: len(self.demand))
+        m.add_collector(lambda: endpoint_stats_families(self.onos.latency_stats()))
+    
+    def start_metrics(self):
+        """Serve /metrics in the background (no-op if metrics_port is None)"""
+        if self.metrics_port is None or self.metrics_server is not None:
+            return
+        self.metrics_server = MetricsServer(self.metrics, port=self.metrics_port)
+        self.metrics_server.start()
+    
+    def start_api(self):
+        """Serve the northbound path API in the background (no-op if api_port is None)"""
+        if self.api_port is None or self.api_server is not None:
+            return
+        self.api_server = NorthboundServer(self, port=self.api_port)
+        self.api_server.start()
+    
+    @timed('topology_fetch_seconds')
     def get_topology(self):
-        """Fetch current topology from ONOS"""
+        """Fetch current topology from ONOS (devices, links and hosts in parallel)"""
         try:
-            # Get devices
-            devices_url = f"{self.onos_url}/onos/v1/devices"
-            devices_resp = requests.get(devices_url, auth=self.auth, timeout=5)
-            devices = devices_resp.json().get('devices', [])
-            
-            # Get links
-            links_url = f"{self.onos_url}/onos/v1/links"
-            links_resp = requests.get(links_url, auth=self.auth, timeout=5)
-            links = links_resp.json().get('links', [])
-            
-            # Get hosts
-            hosts_url = f"{self.onos_url}/onos/v1/hosts"
-            hosts_resp = requests.get(hosts_url, auth=self.auth, timeout=5)
-            hosts = hosts_resp.json().get('hosts', [])
-            
-            return devices, links, hosts
+            return self.onos.get_topology()
         except Exception as e:
             logger.error(f"Error fetching topology: {e}")
             return [], [], []
     
+    @timed('build_graph_seconds')
     def build_graph(self, devices, links, hosts):
-        """Build NetworkX graph from ONOS topology"""
-        self.topology.clear()
-        
-        # Add switches
-        for device in devices:
-            if device.get('available'):
-                self.topology.add_node(device['id'], type='switch')
-        
-        # Add hosts
-        for host in hosts:
-            host_id = host['id']
-            self.topology.add_node(host_id, type='host')
-            # Connect host to its switch
-            for location in host.get('locations', []):
-                device_id = location['elementId']
-                if device_id in self.topology:
-                    link_key = f"{host_id}-{device_id}"
-                    self.topology.add_edge(host_id, device_id)
-                    self.initialize_link_metrics(link_key)
-        
-        # Add links between switches
-        for link in links:
-            if link.get('state') == 'ACTIVE':
-                src = link['src']['device']
-                dst = link['dst']['device']
-                link_key = f"{src}-{dst}"
-                
-                self.topology.add_edge(src, dst)
-                self.initialize_link_metrics(link_key)
+        """
+        Update NetworkX graph from ONOS topology
+        
+        Only node/edge additions and removals are applied; the graph (and any
+        state derived from it) is kept when nothing changed.
+        
+        Returns:
+            TopologyChangeSet describing what changed since the previous call
+        """
+        changes = apply_topology_diff(self.topology, devices, links, hosts)
+        if self.port_map.update(links, hosts):
+            # New or moved ports: pick up their speeds on the next statistics pull
+            self.port_stats.speeds_stale = True
+        
+        # Initialize metrics for newly seen links (both directions in directed mode)
+        for u, v in changes.added_edges:
+            self.initialize_link_metrics(u, v)
+            if self.edge_metrics.registry.directed:
+                self.initialize_link_metrics(v, u)
+        
+        # Record link up/down transitions and re-score the links involved
+        went_down, came_up = self.link_history.apply_changes(changes)
+        for link in went_down:
+            for eid in self.link_edge_ids(link):
+                self.edge_metrics.failures[eid] += 1
+        if went_down or came_up:
+            self.refresh_link_reliability(went_down | came_up)
+        
+        if not changes.is_empty():
+            self.version += 1
+            if changes.added_nodes or changes.removed_nodes:
+                self.friendly_names.refresh(self.topology, self.version)
+            if changes.adds_switch_capacity():
+                # New switch capacity can shorten any path
+                self.path_cache.clear()
+            else:
+                self.path_cache.invalidate_edges(changes.removed_edges)
+                self.path_cache.invalidate_nodes(changes.removed_nodes | changes.touched_hosts)
+            logger.info(f"Graph updated: {self.topology.number_of_nodes()} nodes, {self.topology.number_of_edges()} edges ({changes})")
+        
+        return changes
+    
+    def initialize_link_metrics(self, src, dst):
+        """
+        Initialize metrics for a link
+        
+        Returns:
+            Edge id of the link
+        """
+        # Start with perfect reliability and the link's full capacity
+        return self.edge_metrics.ensure(src, dst, reliability=1.0, bandwidth=self.link_capacity(src, dst))
+    
+    def link_capacity(self, u, v):
+        """Capacity of link u - v in Mbps: its slower known port speed, else default_capacity"""
+        speeds = []
+        for device, neighbor in ((u, v), (v, u)):
+            port = self.port_map.get(device, neighbor)
+            speed = self.port_stats.capacity_mbps.get((device, port)) if port is not None else None
+            if speed:
+                speeds.append(speed)
+        return min(speeds) if speeds else self.default_capacity
+    
+    def update_bandwidth_scale(self, capacity_mbps):
+        """
+        Follow the fastest known link with the bandwidth normalization
+        
+        Keeps the bandwidth term of every score within [0, 1] whatever the
+        port speeds (OVS reports 10 Gbps). A fixed max_bandwidth disables this.
+        
+        Returns:
+            True if the scale moved (every cached score is then stale)
+        """
+        if self.max_bandwidth is not None:
+            return False
+        speeds = [capacity_mbps.get((device, port)) for (device, _), port in self.port_map.ports.items()]
+        scale = max([speed for speed in speeds if speed], default=self.default_capacity)
+        if scale == self.edge_metrics.max_bandwidth:
+            return False
+        
+        logger.info(f"Bandwidth scores now normalized to {scale:.0f} Mbps")
+        self.edge_metrics.max_bandwidth = scale
+        self.version += 1
+        self.path_cache.clear()
+        self.dirty_pairs |= set(self.best_paths)
+        return True
+    
+    def mark_links_changed(self, edges):
+        """
+        Record a metric change on the given links
+        
+        k-shortest candidates depend on hop counts only, so re-scoring the
+        pairs whose candidates use a changed link is enough. The sweep and
+        exact searches choose candidates by score, and a link they pruned may
+        now win, so there every pair is recomputed.
+        
+        Args:
+            edges: Canonical edge keys (see topology_diff.edge_key) whose metrics changed
+        """
+        self.version += 1
+        if self.path_search in ('sweep', 'exact'):
+            self.path_cache.clear()
+            self.dirty_pairs |= set(self.best_paths)
+            return
+        self.path_cache.invalidate_edges(edges)
+        self.dirty_pairs |= self.pair_index.pairs_for(eid for link in edges for eid in self.link_edge_ids(link))
+    
+    def link_edge_ids(self, link):
+        """Edge ids of a link (two in directed mode, one otherwise; none if unregistered)"""
+        u, v = link
+        ids = {self.edge_metrics.edge_id(u, v), self.edge_metrics.edge_id(v, u)}
+        ids.discard(None)
+        return ids
+    
+    def refresh_link_reliability(self, links=None, threshold=0.01):
+        """
+        Recompute reliability from link history and write it to the edge metric store
         
-        logger.info(f"Graph built: {self.topology.number_of_nodes()} nodes, {self.topology.number_of_edges()} edges")
+        Args:
+            links: Canonical edge keys to refresh (default: every link with failures,
+                whose availability keeps recovering over time)
+            threshold: Minimum change that invalidates cached paths
+        """
+        now = time.time()
+        changed = []
+        for link in (self.link_history.flapping_links() if links is None else links):
+            reliability = self.link_history.reliability(link, now)
+            for eid in self.link_edge_ids(link):
+                if abs(self.edge_metrics.reliability[eid] - reliability) > threshold:
+                    self.edge_metrics.reliability[eid] = reliability
+                    changed.append(link)
+        if changed:
+            self.mark_links_changed(changed)
     
-    def initialize_link_metrics(self, link_key):
-        """Initialize metrics for a link"""
-        if link_key not in self.link_reliability:
-            self.link_reliability[link_key] = 1.0  # Start with perfect reliability
-            self.link_bandwidth[link_key] = 100.0  # Assume 100 Mbps
-            self.link_failures[link_key] = 0
+    def record_link_failure(self, src, dst):
+        """Count a failure of the link src - dst (e.g. reported out of band) and lower its reliability"""
+        link = edge_key(src, dst)
+        eid = self.initialize_link_metrics(src, dst)
+        self.link_history.record(link, up=False)
+        self.link_history.record(link, up=True)
+        self.edge_metrics.failures[eid] += 1
+        self.refresh_link_reliability([link])
     
-    def compute_link_reliability(self, link_key):
+    def compute_link_reliability(self, edge_id):
         """
         Compute link reliability based on failure history
         RAVEN metric: R(l) = uptime / (uptime + downtime)
+        
+        Uptime and downtime are exponentially time-decayed and the result is
+        damped by the recent flap rate (see LinkStateTracker).
         """
-        failures = self.link_failures.get(link_key, 0)
-        # Simple model: reliability decreases with failures
-        reliability = max(0.1, 1.0 - (failures * 0.1))
-        return reliability
+        return self.link_history.reliability(edge_key(*self.edge_metrics.registry.endpoints[edge_id]))
     
     def compute_path_reliability(self, path):
         """
         Compute path reliability as product of link reliabilities
         RAVEN: R(p) = ∏ R(l) for all links l in path
         """
-        reliability = 1.0
-        for i in range(len(path) - 1):
-            link_key = f"{path[i]}-{path[i+1]}"
-            link_reliability = self.compute_link_reliability(link_key)
-            reliability *= link_reliability
-        return reliability
+        edge_ids = self.edge_metrics.path_edge_ids(path)
+        return float(self.edge_metrics.reliability[edge_ids].prod())
     
     def compute_path_bandwidth(self, path):
         """
         Compute available bandwidth (bottleneck link)
         RAVEN: BW(p) = min(BW(l)) for all links l in path
         """
-        min_bandwidth = float('inf')
-        for i in range(len(path) - 1):
-            link_key = f"{path[i]}-{path[i+1]}"
-            bandwidth = self.link_bandwidth.get(link_key, 100.0)
-            min_bandwidth = min(min_bandwidth, bandwidth)
-        return min_bandwidth
+        edge_ids = self.edge_metrics.path_edge_ids(path)
+        if not edge_ids:
+            return float('inf')
+        return float(self.edge_metrics.bandwidth[edge_ids].min())
+    
+    def apply_link_telemetry(self, collector):
+        """
+        Write measured residual bandwidth into the edge metric store
+        
+        Each switch port gives both directions of its link: transmit towards
+        the neighbor and receive from it. Only links whose residual capacity
+        moved by more than bandwidth_change_threshold invalidate cached paths.
+        
+        Args:
+            collector: PortStatsCollector with current smoothed rates
+        """
+        with self.lock:
+            self.update_bandwidth_scale(collector.capacity_mbps)
+            residual = {}  # edge id -> residual Mbps
+            
+            for (device, neighbor), port in self.port_map.ports.items():
+                key = (device, port)
+                if key not in collector.tx_mbps:
+                    continue
+                capacity = collector.capacity_mbps.get(key, self.default_capacity)
+                directions = ((device, neighbor, collector.tx_mbps[key]), (neighbor, device, collector.rx_mbps[key]))
+                for src, dst, used in directions:
+                    eid = self.edge_metrics.edge_id(src, dst)
+                    if eid is None:
+                        continue
+                    # Undirected links keep the busier direction
+                    residual[eid] = min(residual.get(eid, float('inf')), max(0.0, capacity - used))
+            
+            changed = []
+            bandwidth = self.edge_metrics.bandwidth
+            for eid, value in residual.items():
+                if abs(bandwidth[eid] - value) > self.bandwidth_change_threshold:
+                    changed.append(edge_key(*self.edge_metrics.registry.endpoints[eid]))
+                bandwidth[eid] = value
+            
+            if changed:
+                logger.info(f"Link telemetry: residual bandwidth changed on {len(changed)} links")
+                self.mark_links_changed(changed)
+    
+    def start_telemetry(self):
+        """Start collecting port statistics in the background (no-op if stats_interval is 0)"""
+        if not self.stats_interval or self.telemetry is not None:
+            return
+        self.telemetry = TelemetryLoop(self.port_stats, self.apply_link_telemetry, interval=self.stats_interval)
+        self.telemetry.start()
     
     def compute_raven_score(self, path, alpha=0.6, beta=0.4):
         """
@@ -134,8 +395,8 @@ class RAVENController:
         bandwidth = self.compute_path_bandwidth(path)
         hop_count = len(path) - 1
         
-        # Normalize bandwidth (assuming max 100 Mbps)
-        normalized_bandwidth = bandwidth / 100.0
+        # Normalize bandwidth to the fastest link
+        normalized_bandwidth = bandwidth / self.edge_metrics.max_bandwidth
         
         # Penalize longer paths
         hop_penalty = hop_count * 0.1
@@ -156,27 +417,19 @@ class RAVENController:
         Returns:
             Friendly name (e.g., 'h1', 's3', etc.)
         """
-        # OpenFlow device IDs
-        if node_id.startswith('of:'):
-            # Extract the last part of the OpenFlow ID
-            device_num = int(node_id.split(':')[-1], 16)
-            return f's{device_num}'
-        
-        # MAC addresses for hosts
-        if ':' in node_id:
-            # Extract host number from MAC address
-            # Format: 00:00:00:00:XX:YY where XX:YY identifies the host
-            parts = node_id.split(':')
-            if len(parts) >= 6:
-                # Try to extract meaningful host number
-                try:
-                    host_num = int(parts[-1], 16)
-                    return f'h{host_num}'
-                except:
-                    pass
-        
-        # Fallback to original ID
-        return node_id
+        # Precomputed per topology version; unknown ids are parsed on the fly
+        return self.friendly_names.name(node_id)
+    
+    def resolve_node(self, name):
+        """
+        Node id for a node id, friendly name (h1, s3) or host MAC (None if unknown)
+        
+        Raises:
+            AmbiguousName: If the name matches several nodes
+        """
+        if name in self.topology:
+            return name
+        return self.friendly_names.resolve(name)
     
     def format_path(self, path):
         """
@@ -188,59 +441,350 @@ class RAVENController:
         Returns:
             Formatted path string with friendly names
         """
-        return ' -> '.join([self.get_friendly_name(node) for node in path])
+        return self.friendly_names.format_path(path)
+    
+    def path_cache_key(self, src, dst, k=3, alpha=0.6, beta=0.4):
+        """Path cache key for a pair and its scoring parameters"""
+        return (src, dst, k, alpha, beta, self.max_hops)
+    
+    @timed('candidate_paths_seconds')
+    def candidate_paths(self, src, dst, k=3):
+        """Up to k shortest candidate paths between src and dst ([] if none)"""
+        try:
+            # Pull only the k shortest paths instead of enumerating every simple path
+            return k_shortest_paths(self.topology, src, dst, k,
+                                    max_hops=self.max_hops, time_budget=self.path_time_budget)
+        except nx.NetworkXNoPath:
+            return []
     
-    def find_best_path_raven(self, src, dst, k=3):
+    @timed('candidate_sweep_seconds')
+    def sweep_candidate_paths(self, pairs, k=3, alpha=0.6, beta=0.4):
         """
-        Find best path using RAVEN algorithm
+        Candidate paths for many pairs with one single-source search per source
         
-        Args:
-            src: Source node
-            dst: Destination node
-            k: Number of candidate paths to consider
+        Both return the score-maximizing paths of each pair. 'sweep' searches
+        best-first and stops once every destination of a source is found;
+        'exact' builds complete Pareto fronts and can trade exactness for
+        smaller fronts through pareto_epsilon.
         
         Returns:
-            Best path according to RAVEN scoring
+            Dict of (src, dst) -> up to k paths (missing if there is no path)
+        """
+        targets = {}
+        for src, dst in pairs:
+            targets.setdefault(src, []).append(dst)
+        
+        candidates = {}
+        for src, dsts in targets.items():
+            if self.path_search == 'exact':
+                found = pareto_paths(self.topology, self.edge_metrics, src, dsts, k, alpha, beta,
+                                     max_hops=self.max_hops, epsilon=self.pareto_epsilon)
+            else:
+                found = single_source_paths(self.topology, self.edge_metrics, src, dsts, k,
+                                            alpha, beta, max_hops=self.max_hops)
+            for dst, paths in found.items():
+                candidates[(src, dst)] = paths
+        return candidates
+    
+    @timed('scoring_seconds')
+    def score_paths(self, paths, alpha=0.6, beta=0.4):
         """
-        if src not in self.topology or dst not in self.topology:
-            logger.warning(f"Source {self.get_friendly_name(src)} or destination {self.get_friendly_name(dst)} not in topology")
+        Score paths in one vectorized pass over the edge metric arrays
+        
+        Returns:
+            (reliability, bandwidth, score) NumPy arrays, one entry per path
+        """
+        matrix, hops = self.edge_metrics.index_matrix(paths)
+        return batch_score(self.edge_metrics, matrix, hops, alpha, beta)
+    
+    def host_switch(self, node):
+        """Ingress/egress switch of a single-homed host (None for switches and multi-homed hosts)"""
+        if self.topology.nodes[node].get('type') != 'host' or self.topology.degree(node) != 1:
             return None
+        return next(iter(self.topology.neighbors(node)))
+    
+    def route_endpoints(self, src, dst):
+        """
+        Endpoints the path search actually runs between for a pair
         
-        try:
-            # Find k shortest paths
-            paths = list(nx.shortest_simple_paths(self.topology, src, dst))[:k]
-            
+        Host pairs behind single-homed hosts are routed between their
+        switches, so every host pair behind the same two switches shares one
+        computation.
+        """
+        if not self.aggregate_hosts or src not in self.topology or dst not in self.topology:
+            return src, dst
+        src_switch, dst_switch = self.host_switch(src), self.host_switch(dst)
+        if src_switch is None or dst_switch is None:
+            return src, dst
+        return src_switch, dst_switch
+    
+    def compute_best_paths(self, pairs, k=3, alpha=0.6, beta=0.4):
+        """
+        Find the best RAVEN path for many pairs at once
+        
+        Args:
+            pairs: Iterable of (src, dst)
+            k: Number of candidate paths per pair
+            alpha: Weight for reliability
+            beta: Weight for bandwidth
+        
+        Returns:
+            Dict of (src, dst) -> best path (None if there is no path)
+        """
+        return {pair: path for pair, (path, _) in self.compute_scored_paths(pairs, k, alpha, beta).items()}
+    
+    @timed('best_paths_seconds')
+    def compute_scored_paths(self, pairs, k=3, alpha=0.6, beta=0.4):
+        """
+        Find the best RAVEN path and its score for many pairs at once
+        
+        Candidates are searched once per (ingress switch, egress switch) pair
+        and shared by every host pair behind those switches. The winner is
+        picked per host pair with its access links scored in: their
+        reliability scales the reliability term and their bandwidth can be
+        the bottleneck, so hosts behind the same switches can prefer
+        different candidates.
+        
+        Returns:
+            Dict of (src, dst) -> (best path, score); (None, None) if there is no path
+        """
+        routes = {}         # (src, dst) -> (ingress, egress)
+        route_pairs = []
+        same_switch = []    # Hosts on one switch: nothing to search
+        for src, dst in pairs:
+            route = self.route_endpoints(src, dst)
+            routes[(src, dst)] = route
+            if route[0] != route[1]:
+                route_pairs.append(route)
+            elif route != (src, dst):
+                same_switch.append(route[0])
+        
+        # Zero-hop switch paths, cached so the northbound API sees them as computed
+        for switch in same_switch:
+            cache_key = self.path_cache_key(switch, switch, k, alpha, beta)
+            if self.path_cache.get(cache_key) is None:
+                self.path_cache.put(cache_key, [[switch]], [switch], alpha + beta, self.version)
+        
+        route_paths = self.compute_route_paths(dict.fromkeys(route_pairs), k, alpha, beta)
+        
+        results = {}
+        host_routes = {}    # Aggregated host pairs, picked with their access links below
+        for pair, route in routes.items():
+            if route != pair:
+                host_routes[pair] = route
+                continue
+            path = route_paths[route]
+            cached = self.path_cache.peek(self.path_cache_key(*route, k, alpha, beta))
+            score = cached.best_score if path is not None and cached is not None else None
+            results[pair] = (path, score)
+        results.update(self.select_host_paths(host_routes, route_paths, k, alpha, beta))
+        return results
+    
+    def select_host_paths(self, host_routes, route_paths, k=3, alpha=0.6, beta=0.4):
+        """
+        Pick each aggregated host pair's path among its switch pair's candidates
+        
+        Every candidate is scored as the full host-to-host path. Pairs with
+        the same switches and the same access link metrics share one pick.
+        
+        Args:
+            host_routes: Dict of (src, dst) -> (ingress, egress)
+            route_paths: Dict of (ingress, egress) -> best switch path, from compute_route_paths
+        
+        Returns:
+            Dict of (src, dst) -> (best path, score); (None, None) if there is no path
+        """
+        metrics = self.edge_metrics
+        
+        # Switch-to-switch candidates of every route, scored in one pass
+        route_candidates = {}
+        for route in dict.fromkeys(host_routes.values()):
+            if route[0] == route[1]:
+                route_candidates[route] = [[route[0]]]
+                continue
+            cached = self.path_cache.peek(self.path_cache_key(*route, k, alpha, beta))
+            if cached is not None:
+                route_candidates[route] = cached.candidates
+            else:
+                # Evicted during this computation; the winner is all that is left
+                best = route_paths.get(route)
+                route_candidates[route] = [best] if best else []
+        all_paths = [path for paths in route_candidates.values() for path in paths]
+        if all_paths:
+            matrix, hops = metrics.index_matrix(all_paths)
+            reliability, bandwidth, _ = batch_score(metrics, matrix, hops, alpha, beta)
+        route_rows = {}
+        offset = 0
+        for route, paths in route_candidates.items():
+            route_rows[route] = slice(offset, offset + len(paths))
+            offset += len(paths)
+        
+        groups = {}  # (route, access reliability, access bandwidth) -> [(src, dst)]
+        for (src, dst), route in host_routes.items():
+            ids = metrics.path_edge_ids([src, route[0]]) + metrics.path_edge_ids([route[1], dst])
+            key = (route, float(metrics.reliability[ids].prod()), float(metrics.bandwidth[ids].min()))
+            groups.setdefault(key, []).append((src, dst))
+        
+        results = {}
+        for (route, access_reliability, access_bandwidth), group in groups.items():
+            paths = route_candidates[route]
             if not paths:
-                logger.warning(f"No path found between {self.get_friendly_name(src)} and {self.get_friendly_name(dst)}")
-                return None
+                results.update((pair, (None, None)) for pair in group)
+                continue
+            rows = route_rows[route]
+            scores = raven_score(reliability[rows] * access_reliability,
+                                 np.minimum(bandwidth[rows], access_bandwidth),
+                                 hops[rows] + 2, alpha, beta, metrics.max_bandwidth)
+            best = int(scores.argmax())
+            for src, dst in group:
+                results[(src, dst)] = ([src] + list(paths[best]) + [dst], float(scores[best]))
+        return results
+    
+    def compute_route_paths(self, pairs, k=3, alpha=0.6, beta=0.4):
+        """
+        Find the best RAVEN path between many node pairs at once
+        
+        Cached pairs are answered from the path cache; the candidates of all
+        other pairs are scored together in a single batch.
+        
+        Args:
+            pairs: Iterable of (src, dst)
+            k: Number of candidate paths per pair
+            alpha: Weight for reliability
+            beta: Weight for bandwidth
+        
+        Returns:
+            Dict of (src, dst) -> best path (None if there is no path)
+        """
+        results = {}
+        uncached = []  # (pair, cache key)
+        
+        for src, dst in pairs:
+            if src not in self.topology or dst not in self.topology:
+                logger.warning(f"Source {self.get_friendly_name(src)} or destination {self.get_friendly_name(dst)} not in topology")
+                results[(src, dst)] = None
+                continue
             
-            # Score each path using RAVEN
-            best_path = None
-            best_score = float('-inf')
+            cache_key = self.path_cache_key(src, dst, k, alpha, beta)
+            cached = self.path_cache.get(cache_key)
+            if cached is not None:
+                results[(src, dst)] = cached.best_path
+                continue
             
-            for path in paths:
-                score = self.compute_raven_score(path)
-                logger.info(f"Path {self.format_path(path)}: Score = {score:.3f}")
-                
-                if score > best_score:
-                    best_score = score
-                    best_path = path
+            uncached.append(((src, dst), cache_key))
+        
+        swept = None
+        if self.path_search in ('sweep', 'exact'):
+            swept = self.sweep_candidate_paths([pair for pair, _ in uncached], k, alpha, beta)
+        elif self.path_engine is not None and len(uncached) >= self.parallel_min_pairs:
+            results.update(self.compute_best_paths_parallel(uncached, k, alpha, beta))
+            return results
+        
+        pending = []  # (pair, cache key, candidates)
+        for (src, dst), cache_key in uncached:
+            paths = swept.get((src, dst), []) if swept is not None else self.candidate_paths(src, dst, k)
+            if not paths:
+                logger.warning(f"No path exists between {self.get_friendly_name(src)} and {self.get_friendly_name(dst)}")
+                self.path_cache.put(cache_key, [], None, float('-inf'), self.version)
+                results[(src, dst)] = None
+                continue
             
-            logger.info(f"✓ Selected: {self.format_path(best_path)} (Score: {best_score:.3f})")
-            return best_path
+            pending.append(((src, dst), cache_key, paths))
+        
+        if not pending:
+            return results
+        
+        # Score every candidate of every pair in one pass
+        all_paths = [path for _, _, paths in pending for path in paths]
+        _, _, scores = self.score_paths(all_paths, alpha, beta)
+        best_rows = best_per_group(scores, [len(paths) for _, _, paths in pending])
+        
+        # Per-candidate detail is formatted only when debug logging is on
+        debug = logger.isEnabledFor(logging.DEBUG)
+        offset = 0
+        for (pair, cache_key, paths), best_row in zip(pending, best_rows):
+            if debug:
+                for i, path in enumerate(paths):
+                    logger.debug(f"Path {self.format_path(path)}: Score = {scores[offset + i]:.3f}")
+            offset += len(paths)
             
-        except nx.NetworkXNoPath:
-            logger.warning(f"No path exists between {self.get_friendly_name(src)} and {self.get_friendly_name(dst)}")
-            return None
+            best_path = all_paths[best_row]
+            best_score = float(scores[best_row])
+            if debug:
+                logger.debug(f"✓ Selected: {self.format_path(best_path)} (Score: {best_score:.3f})")
+            self.path_cache.put(cache_key, paths, best_path, best_score, self.version)
+            results[pair] = best_path
+        
+        return results
     
-    def install_path_flows(self, path, src_mac, dst_mac):
-        """Install flow rules for the selected path in ONOS"""
-        if not path or len(path) < 2:
-            return False
+    def compute_best_paths_parallel(self, uncached, k=3, alpha=0.6, beta=0.4):
+        """
+        Compute uncached pairs on the process pool and merge them into the path cache
         
-        logger.info(f"Installing flows for path: {' -> '.join(path)}")
+        The graph and edge metrics are shipped to the workers once per version.
+        
+        Args:
+            uncached: List of ((src, dst), cache key)
+        
+        Returns:
+            Dict of (src, dst) -> best path (None if there is no path)
+        """
+        self.path_engine.publish(self.version, self.topology, self.edge_metrics,
+                                 max_hops=self.max_hops, time_budget=self.path_time_budget)
+        cache_keys = dict(uncached)
+        results = {}
+        
+        for pair, paths, best_index, best_score in self.path_engine.compute(cache_keys, k, alpha, beta):
+            best_path = paths[best_index] if paths else None
+            if best_path is None:
+                logger.warning(f"No path exists between {self.get_friendly_name(pair[0])} and {self.get_friendly_name(pair[1])}")
+            self.path_cache.put(cache_keys[pair], paths, best_path, best_score, self.version)
+            results[pair] = best_path
+        
+        return results
+    
+    @timed('find_best_path_seconds')
+    def find_best_path_raven(self, src, dst, k=3, alpha=0.6, beta=0.4):
+        """
+        Find best path using RAVEN algorithm
+        
+        Results are served from the path cache until one of the candidate
+        paths' edges changes.
+        
+        Args:
+            src: Source node
+            dst: Destination node
+            k: Number of candidate paths to consider
+            alpha: Weight for reliability
+            beta: Weight for bandwidth
         
-        # Install flows on each switch in the path
+        Returns:
+            Best path according to RAVEN scoring
+        """
+        return self.compute_best_paths([(src, dst)], k, alpha, beta)[(src, dst)]
+    
+    def host_mac(self, host_id):
+        """MAC address of an ONOS host id (formatted MAC/VLAN)"""
+        return host_id.split('/')[0]
+    
+    def output_port(self, device_id, next_hop):
+        """Output port on device_id towards next_hop (None if unknown)"""
+        return self.port_map.get(device_id, next_hop)
+    
+    def path_flow_rules(self, path, dst_mac, priority=RAVEN_FLOW_PRIORITY):
+        """
+        Flow rules forwarding traffic for dst_mac along a path
+        
+        Args:
+            path: List of nodes from source to destination
+            dst_mac: Destination MAC matched by the rules
+            priority: Flow priority of the rules
+        
+        Returns:
+            One FlowRule per switch on the path, or [] if a port is unknown
+            (a partially installed path would blackhole traffic)
+        """
+        rules = []
         for i in range(len(path) - 1):
             current_node = path[i]
             next_node = path[i + 1]
@@ -249,75 +793,539 @@ class RAVENController:
             if self.topology.nodes[current_node].get('type') == 'host':
                 continue
             
-            # Get output port (simplified - in real scenario, query ONOS for port numbers)
-            success = self.install_flow_rule(current_node, dst_mac, next_node)
-            if not success:
-                logger.error(f"Failed to install flow on {current_node}")
-                return False
+            port = self.output_port(current_node, next_node)
+            if port is None:
+                logger.warning(f"No port known from {self.get_friendly_name(current_node)} to {self.get_friendly_name(next_node)}")
+                return []
+            rules.append(FlowRule(current_node, dst_mac, port, priority))
+        return rules
+    
+    def pair_flow_rules(self, src, dst, path):
+        """Flow rules for both directions of a host pair's path ([] if there is no path)"""
+        if not path or len(path) < 2:
+            return []
+        return self.path_flow_rules(path, self.host_mac(dst)) + self.path_flow_rules(path[::-1], self.host_mac(src))
+    
+    def path_failover_group(self, primary, backup, dst_mac):
+        """
+        Failover group where backup leaves primary, for traffic to dst_mac
         
-        return True
+        Returns:
+            FailoverGroup, or None if the paths never diverge at a switch or a port is unknown
+        """
+        for i in range(min(len(primary), len(backup)) - 1):
+            if primary[i + 1] == backup[i + 1]:
+                continue
+            device = primary[i]
+            if self.topology.nodes[device].get('type') == 'host':
+                return None
+            primary_port = self.output_port(device, primary[i + 1])
+            backup_port = self.output_port(device, backup[i + 1])
+            if primary_port is None or backup_port is None:
+                return None
+            return FailoverGroup(device, dst_mac, primary_port, backup_port)
+        return None
+    
+    def pair_failover_groups(self, src, dst, primary, backup):
+        """Failover groups for both directions of a host pair"""
+        groups = [self.path_failover_group(primary, backup, self.host_mac(dst)),
+                  self.path_failover_group(primary[::-1], backup[::-1], self.host_mac(src))]
+        return [group for group in groups if group is not None]
+    
+    @timed('flow_install_seconds')
+    def install_path_flows(self, path, src_mac, dst_mac):
+        """Install flow rules for the selected path in ONOS"""
+        if not path or len(path) < 2:
+            return False
+        
+        logger.info(f"Installing flows for path: {' -> '.join(path)}")
+        
+        # Install flows on every switch in the path with a single bulk request
+        rules = self.path_flow_rules(path, dst_mac)
+        if not rules:
+            return False
+        
+        batcher = FlowBatcher(self.onos, batch_size=self.flow_batch_size)
+        batcher.add_all(rules)
+        return batcher.flush().ok
+    
+    @timed('flow_install_seconds')
+    def install_paths(self, paths):
+        """
+        Install flows for many host pairs through the bulk flows API
+        
+        Rules are deduplicated across pairs (paths towards the same host share
+        their tail) and pushed in parallel batches.
+        
+        Args:
+            paths: Dict of (src, dst) host pair -> path
+        
+        Returns:
+            FlowInstallReport
+        """
+        batcher = FlowBatcher(self.onos, batch_size=self.flow_batch_size)
+        for (src, dst), path in paths.items():
+            batcher.add_all(self.pair_flow_rules(src, dst, path))
+        return batcher.flush()
     
+    @timed('flow_install_seconds')
     def install_flow_rule(self, device_id, dst_mac, next_hop):
         """Install a single flow rule via ONOS REST API"""
-        url = f"{self.onos_url}/onos/v1/flows/{device_id}"
-        
-        flow = {
-            "priority": 40000,
-            "timeout": 0,
-            "isPermanent": True,
-            "deviceId": device_id,
-            "treatment": {
-                "instructions": [
-                    {"type": "OUTPUT", "port": "1"}  # Simplified - should query actual port
-                ]
-            },
-            "selector": {
-                "criteria": [
-                    {"type": "ETH_DST", "mac": dst_mac}
-                ]
-            }
-        }
+        port = self.output_port(device_id, next_hop)
+        if port is None:
+            logger.error(f"No port known from {device_id} to {next_hop}")
+            return False
+        flow = FlowRule(device_id, dst_mac, port).to_json()
         
         try:
-            response = requests.post(url, json=flow, auth=self.auth, timeout=5)
+            response = self.onos.post(f"flows/{device_id}", json=flow)
             return response.status_code in [200, 201]
         except Exception as e:
             logger.error(f"Error installing flow: {e}")
             return False
     
+    def fail_over(self, changes):
+        """
+        Move pairs whose primary lost a link onto their precomputed backups
+        
+        Runs before any path search; the backup flows are staged so the caller
+        can program them right away.
+        
+        Returns:
+            Dict of (src, dst) -> (path, score) before the switch, for each
+            pair switched to its backup
+        """
+        switched = self.backups.failover(changes.removed_edges)
+        if not switched:
+            return {}
+        
+        previous = {}
+        for pair, backup in switched.items():
+            previous[pair] = (self.best_paths.get(pair), self.path_scores.pop(pair, None))
+            self.best_paths[pair] = backup
+            self.path_versions[pair] = self.version
+            self.stage_flows(pair, self.pair_flow_rules(*pair, backup))
+        self.pairs_failed_over.inc(len(switched))
+        logger.info(f"Failed over {len(switched)} pairs to precomputed backup paths")
+        return previous
+    
+    def update_backups(self, pairs):
+        """
+        Precompute disjoint backups for the current best paths of pairs
+        
+        Backups are computed on the switch part of a path, once per distinct
+        switch path, and wrapped with the host access links.
+        """
+        switch_backups = {}
+        for pair in pairs:
+            path = self.best_paths.get(pair)
+            backup = None
+            if path:
+                start = 1 if self.topology.nodes[path[0]].get('type') == 'host' else 0
+                end = len(path) - 1 if self.topology.nodes[path[-1]].get('type') == 'host' else len(path)
+                core = tuple(path[start:end])
+                if core not in switch_backups:
+                    switch_backups[core] = disjoint_backup(self.topology, self.edge_metrics, list(core),
+                                                           node_disjoint=self.backup_node_disjoint)
+                if switch_backups[core]:
+                    backup = path[:start] + switch_backups[core] + path[end:]
+            
+            self.backups.set(pair, path, backup)
+            if self.install_flows and self.fast_failover:
+                # Groups switch locally at the divergence point; standby rules carry traffic from there
+                src, dst = pair
+                groups = self.pair_failover_groups(src, dst, path, backup) if backup else []
+                standby = []
+                if backup:
+                    standby = (self.path_flow_rules(backup, self.host_mac(dst), BACKUP_FLOW_PRIORITY)
+                               + self.path_flow_rules(backup[::-1], self.host_mac(src), BACKUP_FLOW_PRIORITY))
+                self.stage_failover_groups(pair, groups)
+                self.stage_flows(('backup',) + pair, standby)
+    
+    def index_pair(self, pair, k=3, alpha=0.6, beta=0.4):
+        """Record the edges of a pair's selected and candidate paths in the reverse index"""
+        registry = self.edge_metrics.registry
+        edge_ids = set(registry.path_edge_ids(self.best_paths.get(pair) or []))
+        cached = self.path_cache.peek(self.path_cache_key(*self.route_endpoints(*pair), k, alpha, beta))
+        if cached is not None:
+            for path in cached.candidates:
+                edge_ids.update(registry.path_edge_ids(path))
+        self.pair_index.update(pair, edge_ids)
+    
+    def dependent_pairs(self, changes, host_nodes, host_pairs):
+        """
+        Host pairs that must be recomputed after a change set
+        
+        Pairs on removed links come from the edge index and pairs of new or
+        moved hosts from the touched hosts, so no path is scanned. New switch
+        capacity may improve any pair, so it selects them all.
+        """
+        if changes.adds_switch_capacity():
+            return set(host_pairs)
+        
+        removed_ids = {eid for link in changes.removed_edges for eid in self.link_edge_ids(link)}
+        pairs = self.pair_index.pairs_for(removed_ids) | self.dirty_pairs
+        
+        # Pairs are ordered as in host_pairs: (earlier host, later host)
+        order = {host: i for i, host in enumerate(host_nodes)}
+        for host in changes.touched_hosts:
+            if host not in order:
+                continue
+            for other in host_nodes:
+                if other != host:
+                    pairs.add((host, other) if order[host] < order[other] else (other, host))
+        return pairs
+    
+    def demand_pairs(self, host_nodes):
+        """Active demand pairs between current hosts, ordered as (earlier host, later host)"""
+        order = {host: i for i, host in enumerate(host_nodes)}
+        pairs = []
+        for a, b in self.demand.pairs():
+            if a in order and b in order:
+                pairs.append((a, b) if order[a] < order[b] else (b, a))
+        return pairs
+    
+    def fetch_demand(self):
+        """
+        Poll the demand sources (REST only, no lock held)
+        
+        Returns:
+            (set of (src MAC, dst MAC), set of (ingress device, dst MAC))
+        """
+        observed, ingress = set(), set()
+        for source in self.demand_sources:
+            try:
+                pairs, alive = source.poll()
+            except Exception as e:
+                logger.warning(f"Error polling {type(source).__name__}: {e}")
+                continue
+            observed |= pairs
+            ingress |= alive
+        return observed, ingress
+    
+    def apply_demand(self, observed, ingress=()):
+        """
+        Update the active pairs from polled demand and evict idle ones
+        
+        Args:
+            observed: (src MAC, dst MAC) pairs seen carrying traffic
+            ingress: (device, dst MAC) of RAVEN rules that carried traffic;
+                they keep known pairs from hosts behind that device alive
+        
+        Returns:
+            True if pairs became active or were evicted
+        """
+        hosts = {self.host_mac(n).upper(): n for n, d in self.topology.nodes(data=True) if d.get('type') == 'host'}
+        added = 0
+        for src_mac, dst_mac in observed:
+            src, dst = hosts.get(src_mac.upper()), hosts.get(dst_mac.upper())
+            if src is not None and dst is not None and src != dst:
+                added += self.demand.touch(src, dst)
+        
+        if ingress:
+            ingress = {(device, mac.upper()) for device, mac in ingress}
+            for a, b in self.demand.pairs():
+                if a not in self.topology or b not in self.topology:
+                    continue
+                if ((self.host_switch(a), self.host_mac(b).upper()) in ingress
+                        or (self.host_switch(b), self.host_mac(a).upper()) in ingress):
+                    self.demand.touch(a, b)
+        
+        evicted = self.demand.expire()
+        if added or evicted:
+            logger.info(f"Demand: {added} new, {len(evicted)} idle pairs evicted, {len(self.demand)} active")
+        return bool(added or evicted)
+    
+    def learn_demand(self, force=False):
+        """
+        Poll demand sources at most every demand_interval seconds (no-op unless demand_driven)
+        
+        Returns:
+            True if the set of active pairs changed
+        """
+        if not self.demand_driven:
+            return False
+        now = time.monotonic()
+        if not force and now - self.demand_polled_at < self.demand_interval:
+            return False
+        self.demand_polled_at = now
+        observed, ingress = self.fetch_demand()
+        with self.lock:
+            return self.apply_demand(observed, ingress)
+    
+    def request_demand(self, src, dst):
+        """
+        Mark a host pair active on request (e.g. from a packet-in handler)
+        and wake the monitoring loop so its path is installed right away
+        (within poll_min_interval while streaming events)
+        
+        Returns:
+            True if the pair was not active yet
+        """
+        added = self.demand.touch(src, dst)
+        if added:
+            self.wakeup.set()
+        return added
+    
+    def forget_pair(self, pair):
+        """Drop all state of a host pair that no longer exists"""
+        self.best_paths.pop(pair, None)
+        self.path_scores.pop(pair, None)
+        self.path_versions.pop(pair, None)
+        self.pair_index.remove(pair)
+        self.dirty_pairs.discard(pair)
+        self.backups.remove(pair)
+        self.stage_flows(pair, [])
+        self.stage_flows(('backup',) + pair, [])
+        self.stage_failover_groups(pair, [])
+    
+    def stage_flows(self, pair, rules):
+        """Queue the flow rules a pair needs for the next program_flows() (no-op without install_flows)"""
+        if self.install_flows:
+            self.pending_flows[pair] = rules
+    
+    def stage_failover_groups(self, pair, groups):
+        """Queue the failover groups a pair needs for the next program_flows()"""
+        if self.install_flows and self.fast_failover:
+            self.pending_groups[pair] = groups
+    
+    def take_flow_updates(self):
+        """
+        Hand over the staged flow and group updates
+        
+        Returns:
+            (pair -> rules, pair -> failover groups), or None if nothing is staged
+        """
+        with self.lock:
+            if not (self.pending_flows or self.pending_groups):
+                return None
+            updates = (self.pending_flows, self.pending_groups)
+            self.pending_flows, self.pending_groups = {}, {}
+            return updates
+    
+    @timed('flow_sync_seconds')
+    def apply_flow_updates(self, flows, groups):
+        """Reconcile staged updates against the installed flows and groups in ONOS"""
+        for pair, rules in flows.items():
+            self.flow_store.set_pair(pair, rules)
+        for pair, pair_groups in groups.items():
+            self.failover_groups.set_pair(pair, pair_groups)
+        # Unchanged paths cost no REST calls
+        self.flow_store.sync()
+        if self.fast_failover:
+            self.failover_groups.sync()
+    
+    def program_flows(self):
+        """Push everything staged so far to ONOS"""
+        updates = self.take_flow_updates()
+        if updates is not None:
+            self.apply_flow_updates(*updates)
+    
+    @timed('cycle_seconds')
+    def update_paths(self, changes, program_flows=True, failed_over=None):
+        """
+        Recompute best paths for the host pairs affected by a change set
+        
+        Args:
+            changes: TopologyChangeSet returned by build_graph
+            program_flows: Push flow changes to ONOS before returning (False
+                leaves them staged for take_flow_updates)
+            failed_over: What fail_over(changes) returned, if the caller
+                already moved pairs to backups (None = fail over here)
+        """
+        # Restore traffic on precomputed backups before any search
+        if failed_over is None:
+            failed_over = self.fail_over(changes) if self.backup_paths else {}
+            if failed_over and program_flows:
+                self.program_flows()
+        
+        # Reliability of links that failed keeps drifting as they stay up
+        self.refresh_link_reliability()
+        
+        # Find all host pairs (or only those with traffic) and compute best paths
+        host_nodes = [n for n, d in self.topology.nodes(data=True) if d.get('type') == 'host']
+        if self.demand_driven:
+            host_pairs = self.demand_pairs(host_nodes)
+        else:
+            host_pairs = [(src, dst) for i, src in enumerate(host_nodes) for dst in host_nodes[i+1:]]
+        
+        report = CycleReport(self.version, len(host_nodes), len(host_pairs))
+        report.failed_over = len(failed_over)
+        failed_over = dict(failed_over)  # Pairs still to report, from their path before the switch
+        
+        # Forget pairs whose hosts disappeared (or, on demand, that went idle)
+        current_pairs = set(host_pairs)
+        for pair in [p for p in self.best_paths if p not in current_pairs]:
+            self.forget_pair(pair)
+            report.forgotten += 1
+        
+        # Only recompute pairs depending on what changed (links, hosts or link metrics)
+        affected = self.dependent_pairs(changes, host_nodes, host_pairs)
+        pairs = [p for p in host_pairs if p in affected or p not in self.best_paths]
+        self.dirty_pairs = set()
+        self.pairs_recomputed.inc(len(pairs))
+        
+        scored_paths = self.compute_scored_paths(pairs)
+        
+        # Per-pair lines only in debug mode; the cycle report lists changes
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for pair in pairs:
+            best_path, score = scored_paths[pair]
+            old_path, old_score = failed_over.pop(pair, (self.best_paths.get(pair), self.path_scores.get(pair)))
+            report.record(pair, old_path, best_path, old_score, score)
+            if best_path != old_path or pair not in self.path_versions:
+                self.path_versions[pair] = self.version
+            self.best_paths[pair] = best_path
+            self.path_scores[pair] = score
+            self.index_pair(pair)
+            if debug:
+                logger.debug(f"{self.get_friendly_name(pair[0])} -> {self.get_friendly_name(pair[1])}: "
+                             f"{self.format_path(best_path) if best_path else 'no path'} (score {score})")
+        for pair, (old_path, old_score) in failed_over.items():
+            if pair in self.best_paths:
+                report.record_failover(pair, old_path, self.best_paths[pair], old_score)
+        
+        if self.backup_paths:
+            # New primaries, and pairs whose backup just lost a link
+            stale = self.backups.backed_up_through(changes.removed_edges)
+            self.update_backups(set(pairs) | {p for p in stale if p in current_pairs})
+        
+        if self.install_flows:
+            for src, dst in pairs:
+                self.stage_flows((src, dst), self.pair_flow_rules(src, dst, self.best_paths[(src, dst)]))
+            if program_flows:
+                self.program_flows()
+        
+        report.finish()
+        self.last_report = report
+        if report.recomputed or report.forgotten or report.failed_over:
+            # Through the controller's logger, so its level governs the report too
+            report.log(self.friendly_names, self.report_top_n, logger)
+        else:
+            logger.debug(report.summary())
+        logger.debug(f"Path cache: {self.path_cache.stats()}")
+    
+    def refresh_topology(self):
+        """
+        Fetch the full topology from ONOS and update paths
+        
+        Returns:
+            TopologyChangeSet, or None if ONOS returned nothing
+        """
+        self.learn_demand()
+        devices, links, hosts = self.get_topology()
+        if not (devices or links):
+            return None
+        
+        with self.lock:
+            if self.rest_topology_unchanged():
+                # ONOS answered with the same topology the graph was built from; skip the diff
+                changes = TopologyChangeSet()
+            else:
+                self.snapshot.load(devices, links, hosts)
+                changes = self.build_graph(devices, links, hosts)
+            
+            # Also picks up pairs invalidated by link telemetry since the last cycle
+            self.update_paths(changes)
+        logger.debug(f"ONOS latency: {self.onos.latency_stats()}")
+        return changes
+    
+    def rest_topology_unchanged(self):
+        """
+        True if the last REST fetch matches the graph
+        
+        An identical REST body only proves nothing changed since the previous
+        fetch; events applied since then may have moved the graph away from
+        it (e.g. a missed LINK_ADDED), so the resync must rebuild.
+        """
+        return (self.topology.number_of_nodes() > 0 and not self.snapshot.applied_events
+                and not self.onos.changed())
+    
+    def handle_events(self, events):
+        """
+        Apply pushed topology events and update paths without any REST fetch
+        
+        Args:
+            events: List of TopologyEvent
+        
+        Returns:
+            TopologyChangeSet, or None if no event was applicable
+        """
+        with self.lock:
+            if not any([self.snapshot.apply(event) for event in events]):
+                return None
+            
+            changes = self.build_graph(*self.snapshot.lists())
+            if not changes.is_empty():
+                self.update_paths(changes)
+            return changes
+    
+    def stream_events(self):
+        """
+        React to pushed events until the event stream becomes unavailable
+        
+        A full REST resync runs first and then every resync_interval seconds
+        in case an event was missed.
+        
+        Raises:
+            EventStreamUnavailable: When the event source cannot be reached
+        """
+        self.refresh_topology()
+        last_sync = time.monotonic()
+        logger.info("Event stream connected, waiting for topology events...")
+        
+        # A long poll cannot be interrupted, so demand requests are picked up between shorter ones
+        timeout = self.poll_min_interval if self.demand_driven else self.poll_max_interval
+        while True:
+            events = self.event_source.poll(timeout=timeout)
+            woken = self.wakeup.is_set()
+            self.wakeup.clear()
+            if events:
+                logger.info(f"Received {len(events)} topology events")
+                self.handle_events(events)
+            if woken or not events:
+                # Recompute pairs invalidated by link telemetry or new demand
+                self.learn_demand()
+                with self.lock:
+                    self.update_paths(TopologyChangeSet())
+            
+            if time.monotonic() - last_sync >= self.resync_interval:
+                self.refresh_topology()
+                last_sync = time.monotonic()
+    
     def monitor_and_update(self):
-        """Continuously monitor topology and update paths"""
+        """
+        Continuously monitor topology and update paths
+        
+        Uses the event stream when one is configured, otherwise (or while the
+        stream is unavailable) polls ONOS with an interval that backs off
+        while nothing changes.
+        """
         logger.info("Starting RAVEN controller monitoring...")
+        self.start_telemetry()
+        self.start_metrics()
+        self.start_api()
+        
+        poller = AdaptivePoller(self.poll_min_interval, self.poll_max_interval)
+        stream_retry_at = 0.0
         
         while True:
             try:
-                # Fetch topology
-                devices, links, hosts = self.get_topology()
+                if self.event_source is not None and time.monotonic() >= stream_retry_at:
+                    try:
+                        self.stream_events()
+                    except EventStreamUnavailable as e:
+                        logger.warning(f"Event stream unavailable ({e}), falling back to polling")
+                        stream_retry_at = time.monotonic() + self.resync_interval
                 
-                if devices or links:
-                    # Build graph
-                    self.build_graph(devices, links, hosts)
-                    
-                    # Find all host pairs and compute best paths
-                    host_nodes = [n for n, d in self.topology.nodes(data=True) if d.get('type') == 'host']
-                    
-                    logger.info(f"Found {len(host_nodes)} hosts")
-                    
-                    # Example: Compute paths between all host pairs
-                    for i, src in enumerate(host_nodes):
-                        for dst in host_nodes[i+1:]:
-                            src_name = self.get_friendly_name(src)
-                            dst_name = self.get_friendly_name(dst)
-                            logger.info(f"\n{'='*60}")
-                            logger.info(f"Computing paths: {src_name} → {dst_name}")
-                            logger.info(f"{'='*60}")
-                            best_path = self.find_best_path_raven(src, dst)
-                            if best_path:
-                                logger.info(f"★ BEST PATH: {self.format_path(best_path)}")
-                                logger.info(f"{'='*60}\n")
+                # Fetch topology
+                changes = self.refresh_topology()
+                changed = changes is not None and not changes.is_empty()
                 
                 # Sleep before next update
-                time.sleep(10)
+                # Demand requests cut the wait short
+                self.wakeup.wait(poller.next_interval(changed))
+                self.wakeup.clear()
                 
             except KeyboardInterrupt:
                 logger.info("Shutting down RAVEN controller")
@@ -327,13 +1335,63 @@ class RAVENController:
                 time.sleep(5)
 
 def main():
+    logging.getLogger().setLevel(os.environ.get('RAVEN_LOG_LEVEL', 'INFO').upper())
+    
     # Wait for ONOS to be ready
     logger.info("Waiting for ONOS to be ready...")
     time.sleep(30)
     
+    # Optional /metrics endpoint and northbound path API
+    metrics_port = os.environ.get('RAVEN_METRICS_PORT')
+    api_port = os.environ.get('RAVEN_API_PORT')
+    
+    # Bandwidth normalization in Mbps (unset = fastest link reported by ONOS)
+    max_bandwidth = os.environ.get('RAVEN_MAX_BANDWIDTH')
+    
+    # Demand-driven mode: paths only for host pairs with traffic
+    demand_sources = os.environ.get('RAVEN_DEMAND_SOURCES', 'flows,intents')
+    
+    # Optional candidate search limits
+    max_hops = os.environ.get('RAVEN_MAX_HOPS')
+    path_time_budget = os.environ.get('RAVEN_PATH_TIME_BUDGET')
+    path_cache_size = int(os.environ.get('RAVEN_PATH_CACHE_SIZE', 10000))
+    
+    # Event stream (falls back to adaptive polling when unset or unavailable)
+    auth = (os.environ.get('ONOS_USER', 'onos'), os.environ.get('ONOS_PASSWORD', 'rocks'))
+    event_source = event_source_from_url(os.environ.get('RAVEN_EVENT_URL'), auth=auth)
+    
     # Create and start RAVEN controller
-    controller = RAVENController()
-    controller.monitor_and_update()
+    controller = RAVENController(
+        onos_url=os.environ.get('ONOS_URL', 'http://onos:8181'),
+        username=auth[0],
+        password=auth[1],
+        max_hops=int(max_hops) if max_hops else None,
+        path_time_budget=float(path_time_budget) if path_time_budget else None,
+        path_cache_size=path_cache_size,
+        event_source=event_source,
+        poll_min_interval=float(os.environ.get('RAVEN_POLL_MIN_INTERVAL', 1.0)),
+        poll_max_interval=float(os.environ.get('RAVEN_POLL_MAX_INTERVAL', 10.0)),
+        install_flows=os.environ.get('RAVEN_INSTALL_FLOWS', '').lower() in ('1', 'true', 'yes'),
+        flow_batch_size=int(os.environ.get('RAVEN_FLOW_BATCH_SIZE', 200)),
+        stats_interval=float(os.environ.get('RAVEN_STATS_INTERVAL', 5.0)),
+        max_bandwidth=float(max_bandwidth) if max_bandwidth else None,
+        path_workers=int(os.environ.get('RAVEN_PATH_WORKERS', 0)),
+        path_search=os.environ.get('RAVEN_PATH_SEARCH', 'k_shortest'),
+        pareto_epsilon=float(os.environ.get('RAVEN_PARETO_EPSILON', 0.0)),
+        backup_paths=os.environ.get('RAVEN_BACKUP_PATHS', '').lower() in ('1', 'true', 'yes'),
+        fast_failover=os.environ.get('RAVEN_FAST_FAILOVER', '').lower() in ('1', 'true', 'yes'),
+        metrics_port=int(metrics_port) if metrics_port else None,
+        report_top_n=int(os.environ.get('RAVEN_REPORT_TOP', 5)),
+        api_port=int(api_port) if api_port else None,
+        demand_driven=os.environ.get('RAVEN_DEMAND', '').lower() in ('1', 'true', 'yes'),
+        demand_idle_timeout=float(os.environ.get('RAVEN_DEMAND_IDLE_TIMEOUT', 300.0)),
+        demand_interval=float(os.environ.get('RAVEN_DEMAND_INTERVAL', 5.0)),
+        demand_sources=tuple(name.strip() for name in demand_sources.split(',') if name.strip())
+    )
+    if os.environ.get('RAVEN_ASYNC', '').lower() in ('1', 'true', 'yes'):
+        asyncio.run(AsyncRavenRuntime(controller).run())
+    else:
+        controller.monitor_and_update()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Link telemetry for RAVEN
+Pulls ONOS port statistics in one bulk call and turns byte counters into
+smoothed per-port transmit/receive rates
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+PortKey = Tuple[str, str]  # (device id, port number)
+
+
+class PortStatsCollector:
+    """
+    Per-port rate estimator fed by GET /statistics/ports
+
+    Rates are derived from successive cumulative byte counters and smoothed
+    with an exponentially weighted moving average. Port speeds are fetched
+    before the first collection and again whenever speeds_stale is set
+    (the controller sets it when ports appear or move).
+
+    Args:
+        client: OnosClient
+        ewma_alpha: Weight of the newest sample (1.0 = no smoothing)
+    """
+
+    def __init__(self, client, ewma_alpha=0.3):
+        self.client = client
+        self.ewma_alpha = ewma_alpha
+        self.tx_mbps: Dict[PortKey, float] = {}
+        self.rx_mbps: Dict[PortKey, float] = {}
+        self.capacity_mbps: Dict[PortKey, float] = {}
+        self.speeds_stale = True    # Refetch port speeds before the next collection
+        self._last: Dict[PortKey, Tuple[int, int, float]] = {}  # bytesSent, bytesReceived, sample time
+
+    def fetch_port_speeds(self):
+        """Load port capacities (portSpeed, in Mbps) for all devices in one call"""
+        response = self.client.get("devices/ports")
+        capacity = {}
+        for port in response.get('ports', []):
+            speed = port.get('portSpeed')
+            if speed:
+                capacity[(port['element'], str(port['port']))] = float(speed)
+        self.capacity_mbps = capacity
+        self.speeds_stale = False
+
+    def collect(self) -> int:
+        """
+        Fetch port counters once and update the smoothed rates
+
+        Returns:
+            Number of ports with a new rate sample
+        """
+        if self.speeds_stale:
+            try:
+                self.fetch_port_speeds()
+            except Exception as e:
+                # Retried on the next collection
+                logger.warning(f"Could not fetch port speeds, using default capacity: {e}")
+
+        response = self.client.get("statistics/ports")
+        now = time.monotonic()
+        updated = 0
+
+        for device in response.get('statistics', []):
+            device_id = device['device']
+            for port in device.get('ports', []):
+                key = (device_id, str(port['port']))
+                sent = int(port.get('bytesSent', 0))
+                received = int(port.get('bytesReceived', 0))
+
+                last = self._last.get(key)
+                self._last[key] = (sent, received, now)
+                if last is None:
+                    continue
+
+                elapsed = now - last[2]
+                if elapsed <= 0 or sent < last[0] or received < last[1]:
+                    # Counter reset (switch reconnected): wait for the next sample
+                    continue
+
+                self._smooth(self.tx_mbps, key, (sent - last[0]) * 8 / elapsed / 1e6)
+                self._smooth(self.rx_mbps, key, (received - last[1]) * 8 / elapsed / 1e6)
+                updated += 1
+
+        return updated
+
+    def _smooth(self, rates, key, sample):
+        previous = rates.get(key)
+        rates[key] = sample if previous is None else previous + self.ewma_alpha * (sample - previous)
+
+
+class TelemetryLoop:
+    """
+    Runs a PortStatsCollector on its own interval in a background thread
+
+    Args:
+        collector: PortStatsCollector
+        on_sample: Called with the collector after every successful collection
+        interval: Seconds between collections
+    """
+
+    def __init__(self, collector: PortStatsCollector, on_sample: Callable, interval=5.0):
+        self.collector = collector
+        self.on_sample = on_sample
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='raven-telemetry', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.collector.collect():
+                    self.on_sample(self.collector)
+            except Exception as e:
+                logger.warning(f"Error collecting port statistics: {e}")
+            self._stop.wait(self.interval)
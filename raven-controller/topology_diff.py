@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Topology diff engine for RAVEN
+Compares a fresh ONOS device/link/host snapshot against the current graph and
+applies only the node/edge additions and removals
+"""
+
+import logging
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def edge_key(u, v) -> Tuple:
+    """Canonical key for an undirected edge"""
+    return (u, v) if u <= v else (v, u)
+
+
+def path_edges(path) -> List[Tuple]:
+    """Canonical edge keys traversed by a path"""
+    return [edge_key(path[i], path[i + 1]) for i in range(len(path) - 1)]
+
+
+def snapshot_from_onos(devices, links, hosts) -> Tuple[Dict[str, str], Set[Tuple]]:
+    """
+    Convert raw ONOS REST payloads into the node/edge sets RAVEN uses
+
+    Mirrors the rules of RAVENController.build_graph: only available devices,
+    only ACTIVE links, and hosts attached to a known device.
+
+    Returns:
+        (nodes, edges) where nodes maps node id -> type ('switch'/'host')
+        and edges is a set of canonical edge keys
+    """
+    nodes = {}
+    edges = set()
+
+    for device in devices:
+        if device.get('available'):
+            nodes[device['id']] = 'switch'
+
+    for host in hosts:
+        host_id = host['id']
+        nodes[host_id] = 'host'
+        for location in host.get('locations', []):
+            device_id = location['elementId']
+            if nodes.get(device_id) == 'switch':
+                edges.add(edge_key(host_id, device_id))
+
+    for link in links:
+        if link.get('state') == 'ACTIVE':
+            src = link['src']['device']
+            dst = link['dst']['device']
+            if src in nodes and dst in nodes:
+                edges.add(edge_key(src, dst))
+
+    return nodes, edges
+
+
+class TopologyChangeSet:
+    """Node and edge additions/removals produced by one topology update"""
+
+    def __init__(self, added_nodes=None, removed_nodes=None, added_edges=None, removed_edges=None,
+                 touched_hosts=None):
+        self.added_nodes: Dict[str, str] = added_nodes or {}  # node id -> type
+        self.removed_nodes: Set = removed_nodes or set()
+        self.added_edges: Set[Tuple] = added_edges or set()
+        self.removed_edges: Set[Tuple] = removed_edges or set()
+        self.touched_hosts: Set = touched_hosts or set()      # Hosts added, moved or re-attached
+
+    def is_empty(self) -> bool:
+        return not (self.added_nodes or self.removed_nodes or self.added_edges or self.removed_edges)
+
+    def adds_switch_capacity(self) -> bool:
+        """True if a switch or switch-to-switch link appeared (may create better paths for anyone)"""
+        if any(t == 'switch' for t in self.added_nodes.values()):
+            return True
+        # Host attachment edges always have a touched host endpoint
+        return any(u not in self.touched_hosts and v not in self.touched_hosts for u, v in self.added_edges)
+
+    def __repr__(self):
+        return (f"TopologyChangeSet(+{len(self.added_nodes)} nodes, -{len(self.removed_nodes)} nodes, "
+                f"+{len(self.added_edges)} edges, -{len(self.removed_edges)} edges)")
+
+
+def apply_topology_diff(graph, devices, links, hosts) -> TopologyChangeSet:
+    """
+    Bring graph in line with an ONOS snapshot by applying only the differences
+
+    Args:
+        graph: NetworkX graph to update in place
+        devices, links, hosts: Raw ONOS REST lists
+
+    Returns:
+        TopologyChangeSet describing what changed
+    """
+    nodes, edges = snapshot_from_onos(devices, links, hosts)
+
+    current_nodes = set(graph.nodes)
+    current_edges = {edge_key(u, v) for u, v in graph.edges}
+
+    added_nodes = {n: t for n, t in nodes.items()
+                   if n not in current_nodes or graph.nodes[n].get('type') != t}
+    added_edges = edges - current_edges
+    removed_edges = current_edges - edges
+
+    # Hosts whose attachment changed count as touched even though the host node itself is not new
+    touched_hosts = {n for n, t in added_nodes.items() if t == 'host'}
+    touched_hosts.update(n for e in added_edges | removed_edges for n in e if nodes.get(n) == 'host')
+
+    changes = TopologyChangeSet(
+        added_nodes=added_nodes,
+        removed_nodes=current_nodes - nodes.keys(),
+        added_edges=added_edges,
+        removed_edges=removed_edges,
+        touched_hosts=touched_hosts,
+    )
+
+    for u, v in changes.removed_edges:
+        if graph.has_edge(u, v):
+            graph.remove_edge(u, v)
+    graph.remove_nodes_from(changes.removed_nodes)
+    for node_id, node_type in sorted(changes.added_nodes.items()):
+        graph.add_node(node_id, type=node_type)
+    graph.add_edges_from(sorted(changes.added_edges))
+
+    if not changes.is_empty():
+        logger.debug(f"Applied {changes}")
+
+    return changes
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Topology event ingestion for RAVEN
+Event sources push ONOS device/link/host events into the controller so it can
+react within milliseconds, with adaptive polling as the fallback
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# ONOS event types handled by TopologySnapshot.apply
+DEVICE_EVENTS = ('DEVICE_ADDED', 'DEVICE_UPDATED', 'DEVICE_AVAILABILITY_CHANGED', 'DEVICE_REMOVED')
+LINK_EVENTS = ('LINK_ADDED', 'LINK_UPDATED', 'LINK_REMOVED')
+HOST_EVENTS = ('HOST_ADDED', 'HOST_UPDATED', 'HOST_MOVED', 'HOST_REMOVED')
+
+
+class EventStreamUnavailable(Exception):
+    """Raised by an event source when the stream cannot be reached"""
+
+
+class TopologyEvent:
+    """A single ONOS topology event"""
+
+    __slots__ = ('type', 'subject', 'time')
+
+    def __init__(self, type, subject, time=None):
+        self.type = type          # e.g. 'LINK_REMOVED'
+        self.subject = subject    # ONOS JSON object for the device, link or host
+        self.time = time
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['type'], data['subject'], data.get('time'))
+
+    def to_json(self):
+        return {'type': self.type, 'subject': self.subject, 'time': self.time}
+
+    def __repr__(self):
+        return f"TopologyEvent({self.type})"
+
+
+def link_id(link) -> tuple:
+    """Directed identity of an ONOS link"""
+    return (link['src']['device'], link['src'].get('port'), link['dst']['device'], link['dst'].get('port'))
+
+
+class TopologySnapshot:
+    """
+    Local copy of the ONOS device/link/host lists kept current by events
+
+    Lets the controller re-derive its graph from events alone, without
+    another round of REST fetches.
+    """
+
+    def __init__(self):
+        self.devices: Dict[str, dict] = {}
+        self.links: Dict[tuple, dict] = {}
+        self.hosts: Dict[str, dict] = {}
+        self.applied_events = 0     # Events applied since the last full load
+
+    def load(self, devices, links, hosts):
+        """Replace the snapshot with a full REST fetch"""
+        self.devices = {d['id']: d for d in devices}
+        self.links = {link_id(l): l for l in links}
+        self.hosts = {h['id']: h for h in hosts}
+        self.applied_events = 0
+
+    def apply(self, event: TopologyEvent) -> bool:
+        """
+        Apply one event to the snapshot
+
+        Returns:
+            True if the event type was recognised
+        """
+        subject = event.subject
+        if event.type in DEVICE_EVENTS:
+            if event.type == 'DEVICE_REMOVED':
+                self.devices.pop(subject['id'], None)
+            else:
+                self.devices[subject['id']] = subject
+        elif event.type in LINK_EVENTS:
+            if event.type == 'LINK_REMOVED':
+                self.links.pop(link_id(subject), None)
+            else:
+                self.links[link_id(subject)] = subject
+        elif event.type in HOST_EVENTS:
+            if event.type == 'HOST_REMOVED':
+                self.hosts.pop(subject['id'], None)
+            else:
+                self.hosts[subject['id']] = subject
+        else:
+            logger.debug(f"Ignoring unknown event type {event.type}")
+            return False
+        self.applied_events += 1
+        return True
+
+    def lists(self):
+        """Return (devices, links, hosts) in the shape of the ONOS REST API"""
+        return list(self.devices.values()), list(self.links.values()), list(self.hosts.values())
+
+
+class HttpEventStream:
+    """
+    Long-poll subscription to a topology event endpoint
+
+    The endpoint is called as GET <url>?since=<seq>&timeout=<seconds> and
+    answers {"events": [...], "seq": <last seq>} as soon as events are
+    available or the timeout expires.
+    """
+
+    def __init__(self, url, auth=None, session=None):
+        self.url = url
+        self.auth = auth
+        self.session = session or requests.Session()
+        self.seq = 0
+
+    def poll(self, timeout) -> List[TopologyEvent]:
+        try:
+            response = self.session.get(self.url, params={'since': self.seq, 'timeout': timeout},
+                                        auth=self.auth, timeout=timeout + 5)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise EventStreamUnavailable(str(e)) from e
+
+        self.seq = data.get('seq', self.seq)
+        return [TopologyEvent.from_json(e) for e in data.get('events', [])]
+
+
+class FakeEventSource:
+    """
+    In-process stand-in for an ONOS event stream, for tests and local runs
+
+    emit() records events; poll() blocks until at least one event arrived
+    since the previous poll (or the timeout expires) and returns them all.
+    Only the last history_size events are kept, with sequence numbers, so
+    FakeOnos can also serve them to HttpEventStream clients; a reader that
+    falls further behind misses events until its next REST resync.
+    """
+
+    def __init__(self, history_size=1000):
+        self.available = True
+        self.seq = 0
+        self._polled = 0    # Sequence number of the last event returned by poll()
+        self._history: Deque[Tuple[int, TopologyEvent]] = deque(maxlen=history_size)
+        self._emitted = threading.Condition()
+
+    def emit(self, type, subject):
+        event = TopologyEvent(type, subject, time.time())
+        with self._emitted:
+            self.seq += 1
+            self._history.append((self.seq, event))
+            self._emitted.notify_all()
+        return event
+
+    def events_since(self, seq, timeout=0.0) -> Tuple[List[TopologyEvent], int]:
+        """
+        Events after sequence number seq, waiting up to timeout seconds for one
+
+        Returns:
+            (events, sequence number of the last event)
+        """
+        with self._emitted:
+            self._emitted.wait_for(lambda: self.seq > seq, timeout=timeout)
+            return [event for n, event in self._history if n > seq], self.seq
+
+    def poll(self, timeout) -> List[TopologyEvent]:
+        if not self.available:
+            raise EventStreamUnavailable("fake event source disabled")
+        events, self._polled = self.events_since(self._polled, timeout)
+        return events
+
+
+class AdaptivePoller:
+    """
+    Polling interval that backs off while the topology is idle
+
+    The interval doubles after every cycle without changes, up to
+    max_interval, and drops back to min_interval as soon as something changes.
+    """
+
+    def __init__(self, min_interval=1.0, max_interval=10.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+
+    def next_interval(self, changed: bool) -> float:
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * 2)
+        return self.interval
+
+
+def event_source_from_url(url: Optional[str], auth=None):
+    """Build an HttpEventStream for url, or None when no event URL is configured"""
+    if not url:
+        return None
+    return HttpEventStream(url, auth=auth)
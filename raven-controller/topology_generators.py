@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Synthetic topology generators for RAVEN
+Produce device/link/host lists shaped like the ONOS REST API, so generated
+fabrics go through the same code paths as a live ONOS
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+
+def device_id(number):
+    """OpenFlow device id as ONOS formats it (of:0000000000000001)"""
+    return f"of:{number:016x}"
+
+
+def host_mac(number):
+    """Host MAC address for a host number (00:00:00:00:00:01)"""
+    return ':'.join(f"{(number >> shift) & 0xff:02X}" for shift in range(40, -8, -8))
+
+
+class OnosTopologyBuilder:
+    """
+    Accumulates switches, links and hosts and renders them as ONOS JSON
+
+    Ports are allocated sequentially per device in the order links are
+    added, like Mininet does, so a generator that mirrors a Mininet script
+    gets the same port numbers.
+    """
+
+    def __init__(self, default_speed=100):
+        self.devices: List[dict] = []
+        self.links: List[dict] = []
+        self.hosts: List[dict] = []
+        self.default_speed = default_speed           # Mbps
+        self.port_speeds: Dict[Tuple[str, str], float] = {}
+        self._next_port: Dict[str, int] = {}
+
+    def _port(self, device, speed=None):
+        port = self._next_port.get(device, 0) + 1
+        self._next_port[device] = port
+        self.port_speeds[(device, str(port))] = self.default_speed if speed is None else speed
+        return str(port)
+
+    def add_switch(self, number) -> str:
+        did = device_id(number)
+        self.devices.append({"id": did, "type": "SWITCH", "available": True, "role": "MASTER"})
+        return did
+
+    def add_link(self, a, b, speed=None):
+        """Add a bidirectional link (ONOS reports one entry per direction), speed in Mbps"""
+        pa, pb = self._port(a, speed), self._port(b, speed)
+        self.links.append({"src": {"port": pa, "device": a}, "dst": {"port": pb, "device": b},
+                           "type": "DIRECT", "state": "ACTIVE"})
+        self.links.append({"src": {"port": pb, "device": b}, "dst": {"port": pa, "device": a},
+                           "type": "DIRECT", "state": "ACTIVE"})
+
+    def add_host(self, number, switch, speed=None) -> str:
+        mac = host_mac(number)
+        host_id = f"{mac}/None"
+        ip = f"10.{(number >> 16) & 0xff}.{(number >> 8) & 0xff}.{number & 0xff}"
+        self.hosts.append({"id": host_id, "mac": mac, "vlan": "None", "ipAddresses": [ip],
+                           "locations": [{"elementId": switch, "port": self._port(switch, speed)}]})
+        return host_id
+
+    def ports(self) -> List[dict]:
+        """Port list in the shape of GET /devices/ports"""
+        return [{"element": device, "port": port, "isEnabled": True, "portSpeed": speed}
+                for (device, port), speed in self.port_speeds.items()]
+
+    def build(self) -> Tuple[List[dict], List[dict], List[dict]]:
+        return self.devices, self.links, self.hosts
+
+
+def fat_tree(k=4, hosts_per_edge=None, builder: Optional[OnosTopologyBuilder] = None):
+    """
+    k-ary fat-tree: (k/2)^2 core switches, k pods of k/2 aggregation and k/2
+    edge switches, k/2 hosts per edge switch (unless hosts_per_edge is given)
+
+    Args:
+        builder: Builder to add to (a fresh one by default)
+
+    Returns:
+        (devices, links, hosts) in ONOS REST shape
+    """
+    if k % 2:
+        raise ValueError("fat-tree arity k must be even")
+    half = k // 2
+    hosts_per_edge = half if hosts_per_edge is None else hosts_per_edge
+    builder = builder or OnosTopologyBuilder()
+    number = 1
+
+    core = []
+    for _ in range(half * half):
+        core.append(builder.add_switch(number))
+        number += 1
+
+    host_number = 1
+    for pod in range(k):
+        aggs = []
+        for i in range(half):
+            agg = builder.add_switch(number)
+            number += 1
+            aggs.append(agg)
+            # Aggregation switch i connects to core group i
+            for c in range(half):
+                builder.add_link(agg, core[i * half + c])
+        for _ in range(half):
+            edge = builder.add_switch(number)
+            number += 1
+            for agg in aggs:
+                builder.add_link(edge, agg)
+            for _ in range(hosts_per_edge):
+                builder.add_host(host_number, edge)
+                host_number += 1
+
+    return builder.build()
+
+
+def leaf_spine(spines=4, leaves=4, hosts_per_leaf=2, builder: Optional[OnosTopologyBuilder] = None):
+    """
+    Leaf-spine fabric with every leaf connected to every spine
+    (leaf_spine(4, 4, 2) is the Diamond4Topo shape)
+
+    Args:
+        builder: Builder to add to (a fresh one by default)
+
+    Returns:
+        (devices, links, hosts) in ONOS REST shape
+    """
+    builder = builder or OnosTopologyBuilder()
+    spine_ids = [builder.add_switch(n) for n in range(1, spines + 1)]
+    host_number = 1
+    for n in range(spines + 1, spines + leaves + 1):
+        leaf = builder.add_switch(n)
+        for _ in range(hosts_per_leaf):
+            builder.add_host(host_number, leaf)
+            host_number += 1
+        for spine in spine_ids:
+            builder.add_link(leaf, spine)
+    return builder.build()
+
+
+def diamond4(builder: Optional[OnosTopologyBuilder] = None):
+    """topologies/diamond4.py: 4 spines (s1-s4), 4 leaves (s5-s8), 2 hosts per leaf"""
+    return leaf_spine(4, 4, 2, builder)
+
+
+# topologies/datacenter_topology.py switch links, in creation order: (a, b, Mbps)
+DATACENTER_LINKS = [
+    (1, 2, 100),
+    (1, 3, 40), (1, 4, 40),
+    (2, 5, 40), (2, 6, 40),
+    (3, 7, 10), (3, 8, 10),
+    (4, 8, 10), (4, 9, 10),
+    (5, 9, 10), (5, 10, 10),
+    (6, 10, 10), (6, 11, 10), (6, 12, 10),
+    (3, 9, 10), (4, 10, 10), (5, 11, 10),
+]
+
+
+def datacenter(builder: Optional[OnosTopologyBuilder] = None):
+    """
+    topologies/datacenter_topology.py: 2 core, 4 spine and 6 ToR switches,
+    one 1 Mbps host per ToR (MACs 00:00:00:00:01:0X)
+    """
+    builder = builder or OnosTopologyBuilder()
+    switches = {n: builder.add_switch(n) for n in range(1, 13)}
+    for a, b, speed in DATACENTER_LINKS:
+        builder.add_link(switches[a], switches[b], speed)
+    for n in range(1, 7):
+        builder.add_host(0x100 + n, switches[6 + n], speed=1)
+    return builder.build()
+
+
+def random_regular(switches=20, degree=4, hosts_per_switch=1, seed=0,
+                   builder: Optional[OnosTopologyBuilder] = None):
+    """
+    Random degree-regular switch graph with hosts_per_switch hosts on every
+    switch (switches * degree must be even)
+
+    Returns:
+        (devices, links, hosts) in ONOS REST shape
+    """
+    builder = builder or OnosTopologyBuilder()
+    graph = nx.random_regular_graph(degree, switches, seed=seed)
+    switch_ids = [builder.add_switch(n) for n in range(1, switches + 1)]
+    host_number = 1
+    for switch in switch_ids:
+        for _ in range(hosts_per_switch):
+            builder.add_host(host_number, switch)
+            host_number += 1
+    for a, b in sorted(graph.edges()):
+        builder.add_link(switch_ids[a], switch_ids[b])
+    return builder.build()
+
+
+# Generators by name, for command line tools
+TOPOLOGIES = {
+    'fat-tree': fat_tree,
+    'leaf-spine': leaf_spine,
+    'diamond4': diamond4,
+    'datacenter': datacenter,
+    'random-regular': random_regular,
+}
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark all-pairs RAVEN path computation against the process pool size
+Builds a generated fat-tree offline (no ONOS needed) and reports pairs/second
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Run against the controller sources
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'raven-controller'))
+from parallel_paths import ParallelPathEngine
+from raven_controller import RAVENController
+from topology_generators import fat_tree
+
+
+def host_pairs(hosts, limit=None):
+    ids = [host['id'] for host in hosts]
+    pairs = [(src, dst) for src in ids for dst in ids if src != dst]
+    return pairs[:limit] if limit else pairs
+
+
+def run(controller, pairs, workers, k):
+    """Time one cold all-pairs computation with the given pool size"""
+    controller.path_cache.clear()
+    if workers > 1:
+        controller.path_engine = ParallelPathEngine(workers=workers)
+        controller.parallel_min_pairs = 0
+        # Warm the pool so process start-up is not billed to the first run
+        controller.compute_best_paths(pairs[:workers], k)
+        controller.path_cache.clear()
+    else:
+        controller.path_engine = None
+
+    start = time.perf_counter()
+    results = controller.compute_best_paths(pairs, k)
+    elapsed = time.perf_counter() - start
+
+    if controller.path_engine is not None:
+        controller.path_engine.close()
+    return elapsed, sum(1 for path in results.values() if path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--k', type=int, nargs='+', default=[4, 8], help='fat-tree arity (even)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--paths', type=int, default=3, help='candidate paths per pair')
+    parser.add_argument('--max-pairs', type=int, default=None, help='cap on host pairs per topology')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"{'k':>3} {'switches':>8} {'hosts':>6} {'pairs':>7} {'workers':>7} {'seconds':>9} {'pairs/s':>9} {'speedup':>7}")
+    for k in args.k:
+        devices, links, hosts = fat_tree(k)
+        controller = RAVENController()
+        controller.build_graph(devices, links, hosts)
+        pairs = host_pairs(hosts, args.max_pairs)
+
+        baseline = None
+        for workers in args.workers:
+            elapsed, found = run(controller, pairs, workers, args.paths)
+            baseline = baseline or elapsed
+            print(f"{k:>3} {len(devices):>8} {len(hosts):>6} {len(pairs):>7} {workers:>7} "
+                  f"{elapsed:>9.3f} {len(pairs) / elapsed:>9.0f} {baseline / elapsed:>7.2f}")
+            if found != len(pairs):
+                print(f"    warning: {len(pairs) - found} pairs without a path")
+
+
+if __name__ == "__main__":
+    main()
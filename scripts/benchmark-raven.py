@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmark the RAVEN path engine on generated topologies
+Times graph build, candidate generation, scoring and full all-pairs cycles
+offline (no ONOS needed) and writes the results as JSON
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import sys
+import time
+
+import numpy as np
+
+# Run against the controller sources
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'raven-controller'))
+from raven_controller import RAVENController
+from topology_generators import fat_tree, leaf_spine, random_regular
+
+
+def parse_topology(spec):
+    """
+    Topology from a command line spec
+
+    fat-tree:K, leaf-spine:SPINESxLEAVES[xHOSTS], random-regular:SWITCHESxDEGREE[xHOSTS]
+    """
+    name, _, size = spec.partition(':')
+    numbers = [int(n) for n in size.split('x')] if size else []
+    if name == 'fat-tree':
+        return name, {'k': numbers[0] if numbers else 4}
+    if name == 'leaf-spine':
+        keys = ('spines', 'leaves', 'hosts_per_leaf')
+        return name, dict(zip(keys, numbers))
+    if name == 'random-regular':
+        keys = ('switches', 'degree', 'hosts_per_switch')
+        return name, dict(zip(keys, numbers))
+    raise argparse.ArgumentTypeError(f"unknown topology {spec!r}")
+
+
+GENERATORS = {'fat-tree': fat_tree, 'leaf-spine': leaf_spine, 'random-regular': random_regular}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def summarize(samples, pairs=None):
+    """
+    Timing summary of a phase
+
+    Args:
+        samples: Seconds per measured unit
+        pairs: Pairs covered by all samples together (adds pairs/sec)
+    """
+    if not samples:
+        return None
+    ms = np.asarray(samples) * 1000.0
+    summary = {
+        "samples": len(samples),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "total_s": round(float(ms.sum()) / 1000.0, 4),
+    }
+    if pairs is not None:
+        summary["pairs"] = pairs
+        summary["pairs_per_sec"] = round(pairs / max(float(ms.sum()) / 1000.0, 1e-12), 1)
+    return summary
+
+
+def randomize_link_metrics(controller, rng):
+    """Spread reliability and bandwidth so candidates do not tie"""
+    metrics = controller.edge_metrics
+    for u, v in controller.topology.edges():
+        eid = metrics.edge_id(u, v)
+        if eid is not None:
+            metrics.reliability[eid] = rng.uniform(0.9, 1.0)
+            metrics.bandwidth[eid] = rng.choice((10.0, 40.0, 100.0))
+
+
+def new_controller(args):
+    return RAVENController(max_hops=args.max_hops, path_search=args.path_search)
+
+
+def bench_build(args, devices, links, hosts):
+    """Cold graph builds on fresh controllers"""
+    samples = []
+    for _ in range(args.repeat):
+        controller = new_controller(args)
+        start = time.perf_counter()
+        controller.build_graph(devices, links, hosts)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_candidates(args, controller, route_pairs):
+    """
+    Candidate generation per switch pair
+
+    The single-source searches are timed per source and cover all sampled
+    destinations of that source in one call.
+    """
+    samples = []
+    candidates = {}
+    if args.path_search == 'k_shortest':
+        for src, dst in route_pairs:
+            start = time.perf_counter()
+            candidates[(src, dst)] = controller.candidate_paths(src, dst, args.paths)
+            samples.append(time.perf_counter() - start)
+    else:
+        by_source = {}
+        for pair in route_pairs:
+            by_source.setdefault(pair[0], []).append(pair)
+        for pairs in by_source.values():
+            start = time.perf_counter()
+            candidates.update(controller.sweep_candidate_paths(pairs, args.paths))
+            samples.append(time.perf_counter() - start)
+    return summarize(samples, len(route_pairs)), candidates
+
+
+def bench_scoring(args, controller, candidates):
+    """Vectorized scoring of each pair's candidates, then of all of them in one batch"""
+    samples = []
+    all_paths = []
+    for paths in candidates.values():
+        if not paths:
+            continue
+        all_paths.extend(paths)
+        start = time.perf_counter()
+        controller.score_paths(paths)
+        samples.append(time.perf_counter() - start)
+
+    batch = None
+    if all_paths:
+        start = time.perf_counter()
+        controller.score_paths(all_paths)
+        batch = summarize([time.perf_counter() - start], len(samples))
+    return summarize(samples, len(samples)), batch
+
+
+def bench_best_path(args, controller, route_pairs):
+    """find_best_path_raven per switch pair with a cold path cache"""
+    samples = []
+    for src, dst in route_pairs:
+        controller.path_cache.clear()
+        start = time.perf_counter()
+        controller.find_best_path_raven(src, dst, args.paths)
+        samples.append(time.perf_counter() - start)
+    controller.path_cache.clear()
+    return summarize(samples, len(route_pairs))
+
+
+def bench_cycle(args, devices, links, hosts, rng):
+    """
+    Full update cycles over all host pairs: a cold cycle (empty cache), a
+    warm one (nothing changed) and one after a switch link goes down
+    """
+    cold, warm, failure = [], [], []
+    pairs = 0
+    for _ in range(args.cycles):
+        controller = new_controller(args)
+        controller.build_graph(devices, links, hosts)
+        randomize_link_metrics(controller, rng)
+
+        start = time.perf_counter()
+        controller.update_paths(controller.build_graph(devices, links, hosts))
+        cold.append(time.perf_counter() - start)
+        pairs = len(controller.best_paths)
+
+        start = time.perf_counter()
+        controller.update_paths(controller.build_graph(devices, links, hosts))
+        warm.append(time.perf_counter() - start)
+
+        # Drop both directions of one random switch link
+        down = rng.randrange(len(links) // 2) * 2
+        start = time.perf_counter()
+        changes = controller.build_graph(devices, links[:down] + links[down + 2:], hosts)
+        controller.update_paths(changes)
+        failure.append(time.perf_counter() - start)
+
+    return {
+        "cold": summarize(cold, pairs * len(cold)),
+        "warm": summarize(warm, pairs * len(warm)),
+        "link_failure": summarize(failure),
+    }
+
+
+def run_topology(args, name, params, rng):
+    devices, links, hosts = GENERATORS[name](**params)
+    host_pair_count = len(hosts) * (len(hosts) - 1) // 2
+    result = {
+        "topology": name,
+        "params": params,
+        "switches": len(devices),
+        "links": len(links) // 2,
+        "hosts": len(hosts),
+        "host_pairs": host_pair_count,
+        "phases": {},
+    }
+    phases = result["phases"]
+    logging.info(f"{name} {params}: {len(devices)} switches, {len(links) // 2} links, {len(hosts)} hosts")
+
+    phases["build_graph"] = bench_build(args, devices, links, hosts)
+
+    controller = new_controller(args)
+    controller.build_graph(devices, links, hosts)
+    randomize_link_metrics(controller, rng)
+    switches = [device['id'] for device in devices]
+    route_pairs = [(a, b) for i, a in enumerate(switches) for b in switches[i + 1:]]
+    if len(route_pairs) > args.sample_pairs:
+        route_pairs = rng.sample(route_pairs, args.sample_pairs)
+
+    phases["candidates"], candidates = bench_candidates(args, controller, route_pairs)
+    phases["scoring"], phases["scoring_batch"] = bench_scoring(args, controller, candidates)
+    phases["find_best_path_raven"] = bench_best_path(args, controller, route_pairs)
+
+    if host_pair_count <= args.max_cycle_pairs:
+        phases.update(bench_cycle(args, devices, links, hosts, rng))
+    else:
+        logging.info(f"  skipping cycles: {host_pair_count} host pairs > --max-cycle-pairs")
+
+    # Process-wide peak so far: run topologies smallest first
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--topology', type=parse_topology, nargs='+',
+                        default=[parse_topology(spec) for spec in
+                                 ('fat-tree:4', 'leaf-spine:4x8', 'random-regular:50x4', 'fat-tree:8',
+                                  'random-regular:200x6')],
+                        help='fat-tree:K, leaf-spine:SPINESxLEAVES[xHOSTS], '
+                             'random-regular:SWITCHESxDEGREE[xHOSTS]')
+    parser.add_argument('--paths', type=int, default=3, help='candidate paths per pair')
+    parser.add_argument('--path-search', choices=('k_shortest', 'sweep', 'exact'), default='k_shortest')
+    parser.add_argument('--max-hops', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=5, help='graph builds per topology')
+    parser.add_argument('--cycles', type=int, default=3, help='update cycles per topology')
+    parser.add_argument('--sample-pairs', type=int, default=500, help='switch pairs timed per phase')
+    parser.add_argument('--max-cycle-pairs', type=int, default=50000,
+                        help='skip full cycles on topologies with more host pairs')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr, force=True)
+    # Keep the controller's own per-cycle logging out of the timings
+    logging.getLogger('raven_controller').setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {"paths": args.paths, "path_search": args.path_search, "max_hops": args.max_hops,
+                     "seed": args.seed},
+        "results": [run_topology(args, name, params, rng) for name, params in args.topology],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,30 +4,35 @@ Compare RAVEN routing with default ONOS routing
 Run this from your host machine (not inside containers)
 """
 
+import os
+import sys
 import requests
 import json
 import time
 from typing import Dict, List
 
-ONOS_URL = "http://localhost:8181/onos/v1"
+# Share the ONOS REST client with the RAVEN controller
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'raven-controller'))
+from onos_client import OnosClient
+
+ONOS_URL = "http://localhost:8181"
 AUTH = ("onos", "rocks")
+RAVEN_API_URL = os.environ.get('RAVEN_API_URL', "http://localhost:8081")
+
+onos = OnosClient(ONOS_URL, AUTH)
 
 def get_topology():
-    """Fetch current topology from ONOS"""
-    devices = requests.get(f"{ONOS_URL}/devices", auth=AUTH).json()
-    links = requests.get(f"{ONOS_URL}/links", auth=AUTH).json()
-    hosts = requests.get(f"{ONOS_URL}/hosts", auth=AUTH).json()
+    """Fetch current topology from ONOS (devices, links and hosts in parallel)"""
+    devices, links, hosts = onos.get_many(['devices', 'links', 'hosts'])
     return devices, links, hosts
 
 def get_flows():
     """Get all flow rules"""
-    response = requests.get(f"{ONOS_URL}/flows", auth=AUTH)
-    return response.json()
+    return onos.get('flows')
 
 def get_intents():
     """Get all intents"""
-    response = requests.get(f"{ONOS_URL}/intents", auth=AUTH)
-    return response.json()
+    return onos.get('intents')
 
 def analyze_paths():
     """Analyze current path selection"""
@@ -57,6 +62,21 @@ def analyze_paths():
     
     print("\n" + "=" * 60)
 
+def show_raven_paths():
+    """Print the paths RAVEN currently selects (needs the controller's northbound API)"""
+    try:
+        response = requests.get(f"{RAVEN_API_URL}/paths", timeout=5)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        print(f"\nRAVEN API not reachable at {RAVEN_API_URL} (set RAVEN_API_PORT on the controller)")
+        return
+    
+    selected = response.json()
+    print(f"\nRAVEN Selected Paths (version {selected['version']}):")
+    for entry in selected['paths']:
+        score = f"{entry['score']:.3f}" if entry['score'] is not None else "-"
+        print(f"  {entry['names'] or 'no path'}  (score {score})")
+
 def compare_metrics():
     """Compare RAVEN vs default routing metrics"""
     print("\n" + "=" * 60)
@@ -89,15 +109,22 @@ def monitor_changes(duration=60):
     print("(Simulate link failures in Mininet to see RAVEN adapt)")
     
     start_time = time.time()
-    last_link_count = 0
+    last_link_count = None  # Set from the first response
     
     while time.time() - start_time < duration:
         try:
-            _, links, _ = get_topology()
+            links = onos.get('links')
+            # Unchanged bodies are only skipped once there is a baseline to compare with
+            if last_link_count is not None and not onos.changed('links'):
+                time.sleep(2)
+                continue
             active_links = [l for l in links.get('links', []) if l.get('state') == 'ACTIVE']
             link_count = len(active_links)
             
-            if link_count != last_link_count:
+            if last_link_count is None:
+                print(f"  Active links: {link_count}")
+                last_link_count = link_count
+            elif link_count != last_link_count:
                 print(f"\n[{time.strftime('%H:%M:%S')}] Topology changed!")
                 print(f"  Active links: {last_link_count} -> {link_count}")
                 
@@ -124,8 +151,9 @@ def main():
     
     try:
         # Test ONOS connectivity
-        response = requests.get(f"{ONOS_URL}/applications", auth=AUTH, timeout=5)
-        if response.status_code != 200:
+        try:
+            onos.get('applications')
+        except requests.exceptions.HTTPError:
             print("\n❌ Cannot connect to ONOS. Is it running?")
             print("   Start with: docker-compose up -d")
             return
@@ -134,6 +162,7 @@ def main():
         
         # Analyze current state
         analyze_paths()
+        show_raven_paths()
         
         # Show comparison
         compare_metrics()
@@ -148,6 +177,10 @@ def main():
         if choice == "1":
             monitor_changes(60)
         
+        print("\nONOS REST latency:")
+        for endpoint, stats in onos.latency_stats().items():
+            print(f"  /{endpoint}: {stats['requests']} requests, avg {stats['avg_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+        
         print("\n✓ Analysis complete")
         
     except requests.exceptions.ConnectionError: